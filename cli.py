@@ -62,8 +62,14 @@ def outlook_index(reset=False):
 
 @outlook.command("download")
 @click.option("--reset", is_flag=True, default=False, help="Delete .dsed/caches before downloading.")
-def outlook_download(reset=False):
-    return impl_outlook_download(reset)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Re-export messages already downloaded by a previous run, re-fetching their attachments.",
+)
+def outlook_download(reset=False, force=False):
+    return impl_outlook_download(reset, force)
 
 @outlook.command("output")
 @click.argument("outdir")
@@ -74,8 +80,20 @@ def outlook_download(reset=False):
     show_default=True,
     help="Maximum subject length to include in output folder names.",
 )
-def outlook_output(outdir, max_subject_chars=36):
-    return impl_outlook_output(outdir, max_subject_chars=max_subject_chars)
+@click.option(
+    "--hardlink/--copy",
+    default=False,
+    show_default=True,
+    help=(
+        "Hardlink message files from .dsed/caches instead of copying them "
+        "(copies across volumes either way). Linked files are shared with the "
+        "cache: editing one in place also changes the other."
+    ),
+)
+def outlook_output(outdir, max_subject_chars=36, hardlink=False):
+    return impl_outlook_output(
+        outdir, max_subject_chars=max_subject_chars, hardlink=hardlink
+    )
 
 @outlook.command("debug-download")
 @click.argument("features", nargs=-1)
@@ -1,16 +1,69 @@
 import os
-import json
-import time
+import sys
 import threading
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from termcolor import colored
-from typing import Any, Dict, Iterable, List, Tuple, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple, Optional, Union
 
+from pysrc.utils.json_io import json_loads, write_json
 from pysrc.utils.summarize_response import summarize_response
 
 BASE_URL = "http://localhost:3000"  # change if needed
+API_BASE_URL = f"{BASE_URL.rstrip('/')}/api/"
 JWT_PATH = ".dsed/jwt.json"
 
+SUCCESS_LABEL = colored("success", "green")
+FAILED_LABEL = colored("failed", "red")
+
+SESSION_POOL_CONNECTIONS = 4
+SESSION_POOL_MAXSIZE = 16
+
+# The POST routes sent on SESSION only read (ids, metadata, folders), so
+# repeating one is as safe as repeating a GET. Login polling and logout change
+# auth state (and login paces its own polls), so they go on MUTATING_SESSION
+READ_ONLY_RETRY_METHODS = frozenset({"GET", "POST"})
+# urllib3's default: methods that are safe to repeat whatever the route does
+IDEMPOTENT_RETRY_METHODS = frozenset(
+    {"DELETE", "GET", "HEAD", "OPTIONS", "PUT", "TRACE"}
+)
+
+
+def _build_session(retry_methods: frozenset) -> requests.Session:
+    """
+    Build a process-wide session for backend calls.
+    Keeps connections to the backend alive between requests instead of
+    re-connecting per call, and retries retry_methods requests on throttling
+    and gateway errors.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=SESSION_POOL_CONNECTIONS,
+        pool_maxsize=SESSION_POOL_MAXSIZE,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            # 429 is backend/Graph throttling; Retry waits out its Retry-After
+            # (for the methods in allowed_methods only)
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=retry_methods,
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+SESSION = _build_session(READ_ONLY_RETRY_METHODS)
+# For POSTs that change the mailbox or auth state: a 502/504 may come back
+# after the change was made, so those are never sent twice
+MUTATING_SESSION = _build_session(IDEMPOTENT_RETRY_METHODS)
+
 # Assumes summarize_response(resp: requests.Response) -> object with .ok, .status, .text, .data
 # You can keep your existing implementation.
 
@@ -36,29 +89,115 @@ def _flatten_params(params: Dict[str, Any]) -> List[Tuple[str, str]]:
             out.append((k, str(v)))
     return out
 
+# JWTs read successfully, by path. A missing or unreadable file is not
+# cached, so later calls report it again and pick up a fresh login
+_JWT_CACHE: Dict[str, str] = {}
+
+
 def _load_jwt(jwt_path: str = JWT_PATH) -> Optional[str]:
-    if not os.path.exists(jwt_path):
+    """
+    Read the JWT saved by outlook login. Cached for the life of the process
+    once read; cleared when the backend answers 401 so the file is re-read
+    next time.
+    """
+    jwt = _JWT_CACHE.get(jwt_path)
+    if jwt is not None:
+        return jwt
+    try:
+        with open(jwt_path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
         print(colored("JWT not found. Please login first.", "red"))
         return None
-    with open(jwt_path, "r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-            return data.get("jwt")
-        except Exception:
-            print(colored("Failed to read JWT file.", "red"))
-            return None
+    try:
+        jwt = json_loads(raw).get("jwt")
+    except Exception:
+        print(colored("Failed to read JWT file.", "red"))
+        return None
+    if isinstance(jwt, str) and jwt:
+        _JWT_CACHE[jwt_path] = jwt
+    return jwt
 
-def _spinner_line(prompt: str):
-    stop = threading.Event()
-    def spinner():
-        frames = "|/-\\"
-        i = 0
-        while not stop.is_set():
-            print(f"\r{prompt} {frames[i % len(frames)]}", end="", flush=True)
-            time.sleep(0.1)
+
+def _clear_jwt_cache() -> None:
+    _JWT_CACHE.clear()
+
+
+@lru_cache(maxsize=1)
+def _auth_headers(jwt: str) -> Dict[str, str]:
+    # Shared per JWT; requests merges it into a new dict and never mutates it
+    return {"Authorization": f"Bearer {jwt}"}
+
+
+# One spinner thread per process animates whichever prompt was pushed last;
+# call sites only push/pop prompts instead of spawning a thread per request
+_SPINNER_CONDITION = threading.Condition()
+_SPINNER_PROMPTS: List[str] = []
+_SPINNER_THREAD: Optional[threading.Thread] = None
+
+
+def _spinner_loop() -> None:
+    frames = "|/-\\"
+    i = 0
+    with _SPINNER_CONDITION:
+        while True:
+            while not _SPINNER_PROMPTS:
+                _SPINNER_CONDITION.wait()
+            sys.stdout.write(f"\r{_SPINNER_PROMPTS[-1]} {frames[i % len(frames)]}")
+            sys.stdout.flush()
             i += 1
-    t = threading.Thread(target=spinner, daemon=True)
-    return stop, t
+            _SPINNER_CONDITION.wait(0.1)
+
+
+@contextmanager
+def _spinner_line(prompt: str):
+    """
+    Show a spinner after prompt for the duration of the with-block. Frames are
+    written under the same lock that pops the prompt, so nothing is drawn after
+    the block exits.
+    """
+    global _SPINNER_THREAD
+    with _SPINNER_CONDITION:
+        if _SPINNER_THREAD is None:
+            _SPINNER_THREAD = threading.Thread(target=_spinner_loop, daemon=True)
+            _SPINNER_THREAD.start()
+        _SPINNER_PROMPTS.append(prompt)
+        _SPINNER_CONDITION.notify()
+    try:
+        yield
+    finally:
+        with _SPINNER_CONDITION:
+            _SPINNER_PROMPTS.remove(prompt)
+
+
+# Directories already created this process, so repeated debug writes to the
+# same folder skip the makedirs stat/mkdir round trip
+_CREATED_DIRS: Set[str] = set()
+
+
+def _ensure_dir(path: str) -> None:
+    if path and path not in _CREATED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _CREATED_DIRS.add(path)
+
+
+def _report_failure(prompt: str, summary) -> None:
+    print(f"\r{prompt} {FAILED_LABEL}")
+    # Persist server error body for debugging
+    try:
+        _ensure_dir(".dsed/debug")
+        with open(".dsed/debug/error.txt", "w", encoding="utf-8") as f:
+            f.write(summary.text)
+    except Exception:
+        pass
+
+    if getattr(summary, "status", None) == 401:
+        _clear_jwt_cache()
+        print(colored("JWT expired or invalid. Please login again.", "red"))
+    else:
+        print(colored("Request failed:", "red"))
+        print(str(summary))
+
 
 def call_route(
     route: str,
@@ -67,6 +206,8 @@ def call_route(
     json_body: Optional[Union[Dict[str, Any], str, int, float, None]] = None,
     method: Optional[str] = None,
     save_debug_to: Optional[str] = None,  # e.g. ".dsed/debug/folders.json"
+    quiet: bool = False,
+    session: Optional[requests.Session] = None,
 ):
     """
     Generic caller for predictable backend routes.
@@ -78,6 +219,8 @@ def call_route(
         json_body: dict sent as JSON (if provided and method not set, uses POST)
         method: force "GET"/"POST"/... If None, infer (POST if json_body else GET)
         save_debug_to: optional path to write resp.data prettified JSON on success
+        quiet: skip the spinner and success line (for concurrent callers); failures still print
+        session: session to send the request on; defaults to the shared SESSION
 
     Returns:
         summarize_response(requests.Response)
@@ -86,8 +229,8 @@ def call_route(
     if not jwt:
         return None
 
-    url = f"{BASE_URL.rstrip('/')}/api/{route.lstrip('/')}"
-    headers = {"Authorization": f"Bearer {jwt}"}
+    url = API_BASE_URL + route.lstrip("/")
+    headers = _auth_headers(jwt)
 
     # Determine HTTP method
     meth = method.upper() if method else ("POST" if json_body is not None else "GET")
@@ -95,10 +238,8 @@ def call_route(
     # Build query params with repeated keys for arrays
     query_tuples = _flatten_params(params or {})
 
-    stop, t = _spinner_line(prompt)
-    t.start()
-    try:
-        resp = requests.request(
+    with _spinner_line(prompt) if not quiet else nullcontext():
+        resp = (session or SESSION).request(
             meth,
             url,
             headers=headers,
@@ -107,32 +248,67 @@ def call_route(
             timeout=60,
         )
         summary = summarize_response(resp)
-    finally:
-        stop.set()
-        t.join()
 
     if getattr(summary, "ok", False):
-        print(f"\r{prompt} " + colored("success", "green"))
+        if not quiet:
+            print(f"\r{prompt} {SUCCESS_LABEL}")
         if save_debug_to:
-            os.makedirs(os.path.dirname(save_debug_to), exist_ok=True)
-            with open(save_debug_to, "w", encoding="utf-8") as f:
-                f.write(json.dumps(summary.data, indent=2))
+            _ensure_dir(os.path.dirname(save_debug_to))
+            write_json(save_debug_to, summary.data, indent=True)
             print(colored(f"Saved to {save_debug_to}", "green"))
     else:
-        print(f"\r{prompt} " + colored("failed", "red"))
-        # Persist server error body for debugging
-        try:
-            with open(".dsed/debug/error.txt", "w", encoding="utf-8") as f:
-                f.write(summary.text)
-        except Exception:
-            pass
+        _report_failure(prompt, summary)
+        return None
 
-        if getattr(summary, "status", None) == 401:
-            print(colored("JWT expired or invalid. Please login again.", "red"))
-        else:
-            print(colored("Request failed:", "red"))
-            print(str(summary))
+    return summary
+
+
+def call_route_ndjson(
+    route: str,
+    prompt: str = "working...",
+    json_body: Optional[Union[Dict[str, Any], str, int, float, None]] = None,
+    method: Optional[str] = None,
+    quiet: bool = False,
+    session: Optional[requests.Session] = None,
+) -> Optional[Iterator[Any]]:
+    """
+    Like call_route, but for routes that stream application/x-ndjson.
 
+    The spinner runs until response headers arrive. On success, returns an
+    iterator of parsed records that closes the connection once exhausted;
+    on failure, reports like call_route and returns None.
+    """
+    jwt = _load_jwt()
+    if not jwt:
         return None
 
-    return summary
\ No newline at end of file
+    url = API_BASE_URL + route.lstrip("/")
+    headers = _auth_headers(jwt)
+    meth = method.upper() if method else ("POST" if json_body is not None else "GET")
+
+    with _spinner_line(prompt) if not quiet else nullcontext():
+        resp = (session or SESSION).request(
+            meth,
+            url,
+            headers=headers,
+            json=json_body if json_body is not None else None,
+            timeout=60,
+            stream=True,
+        )
+
+    if not resp.ok:
+        _report_failure(prompt, summarize_response(resp))
+        return None
+
+    if not quiet:
+        print(f"\r{prompt} {SUCCESS_LABEL}")
+
+    def records() -> Iterator[Any]:
+        try:
+            for line in resp.iter_lines():
+                if line:
+                    yield json_loads(line)
+        finally:
+            resp.close()
+
+    return records()
\ No newline at end of file
@@ -1,12 +1,14 @@
-import json
 import os
 import random
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from termcolor import colored
 
+from pysrc.utils.json_io import read_json, write_json
+
 
 FEATURE_ALIASES: Dict[str, str] = {
     "html": "html-body",
@@ -28,9 +30,19 @@ FEATURE_ALIASES: Dict[str, str] = {
 }
 
 FEATURE_KEYS = sorted(set(FEATURE_ALIASES.values()))
+# One bit per canonical feature so a query is a single mask test per entry
+FEATURE_BITS: Dict[str, int] = {key: 1 << i for i, key in enumerate(FEATURE_KEYS)}
 
 INDEX_PATH = ".dsed/debug/debug-download.json"
 CACHE_ROOT = ".dsed/caches"
+SCAN_MAX_WORKERS = 8
+
+
+def _feature_mask(features: Iterable[str]) -> int:
+    mask = 0
+    for feature in features:
+        mask |= FEATURE_BITS.get(feature, 0)
+    return mask
 
 
 def _normalize_features(raw_features: Iterable[str]) -> Tuple[Optional[Set[str]], List[str]]:
@@ -49,54 +61,90 @@ def _normalize_features(raw_features: Iterable[str]) -> Tuple[Optional[Set[str]]
 
 
 def _dir_has_entries(path: str, want_files: bool = False) -> bool:
-    if not os.path.isdir(path):
-        return False
     try:
         with os.scandir(path) as it:
             for entry in it:
                 if want_files and not entry.is_file():
                     continue
                 return True
-    except FileNotFoundError:
+    except (FileNotFoundError, NotADirectoryError):
         return False
     return False
 
 
+def _dir_entries(path: str) -> Dict[str, os.DirEntry]:
+    try:
+        with os.scandir(path) as it:
+            return {entry.name: entry for entry in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+
+def _has_file(entries: Dict[str, os.DirEntry], *names: str) -> bool:
+    for name in names:
+        entry = entries.get(name)
+        if entry is not None and entry.is_file():
+            return True
+    return False
+
+
+def _has_dir(entries: Dict[str, os.DirEntry], name: str) -> bool:
+    entry = entries.get(name)
+    return entry is not None and entry.is_dir()
+
+
+def _subdirs(path: str) -> List[str]:
+    try:
+        with os.scandir(path) as it:
+            return [entry.path for entry in it if entry.is_dir(follow_symlinks=False)]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _collect_folder_message_dirs(folder_dir: str) -> List[str]:
+    # Layout is <folder>/<conversation>/<message>/message.json
+    message_dirs: List[str] = []
+    for conversation_dir in _subdirs(folder_dir):
+        for message_dir in _subdirs(conversation_dir):
+            if os.path.isfile(os.path.join(message_dir, "message.json")):
+                message_dirs.append(message_dir)
+    return message_dirs
+
+
 def _collect_message_dirs(base_dir: str) -> List[str]:
     if not os.path.isdir(base_dir):
         return []
+    folder_dirs = _subdirs(base_dir)
     message_dirs: List[str] = []
-    for root, dirs, files in os.walk(base_dir):
-        if "message.json" in files:
-            rel = os.path.relpath(root, base_dir)
-            parts = rel.split(os.sep)
-            if len(parts) == 3:
-                message_dirs.append(root)
-                dirs[:] = []
-                continue
+    with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as executor:
+        for folder_message_dirs in executor.map(_collect_folder_message_dirs, folder_dirs):
+            message_dirs.extend(folder_message_dirs)
     return message_dirs
 
 
 def _features_for_message_dir(message_dir: str) -> Set[str]:
     features: Set[str] = set()
+    # One directory read for the message, one for attachments/, then only the
+    # subfolders that actually exist
+    entries = _dir_entries(message_dir)
 
-    if os.path.isfile(os.path.join(message_dir, "body.html")) or os.path.isfile(
-        os.path.join(message_dir, "uniqueBody.html")
-    ):
+    if _has_file(entries, "body.html", "uniqueBody.html"):
         features.add("html-body")
 
-    if os.path.isfile(os.path.join(message_dir, "body.txt")) or os.path.isfile(
-        os.path.join(message_dir, "uniqueBody.txt")
-    ):
+    if _has_file(entries, "body.txt", "uniqueBody.txt"):
         features.add("text-body")
 
-    attachments_root = os.path.join(message_dir, "attachments")
-    has_file_attachments = _dir_has_entries(
-        os.path.join(attachments_root, "files"), want_files=True
+    attachment_entries: Dict[str, os.DirEntry] = {}
+    if _has_dir(entries, "attachments"):
+        attachment_entries = _dir_entries(entries["attachments"].path)
+    has_file_attachments = _has_dir(attachment_entries, "files") and _dir_has_entries(
+        attachment_entries["files"].path, want_files=True
     )
-    has_item_attachments = _dir_has_entries(os.path.join(attachments_root, "items"))
-    has_link_attachments = _dir_has_entries(
-        os.path.join(attachments_root, "links"), want_files=True
+    has_item_attachments = _has_dir(attachment_entries, "items") and _dir_has_entries(
+        attachment_entries["items"].path
+    )
+    has_link_attachments = _has_dir(attachment_entries, "links") and _dir_has_entries(
+        attachment_entries["links"].path, want_files=True
     )
 
     if has_file_attachments:
@@ -108,19 +156,28 @@ def _features_for_message_dir(message_dir: str) -> Set[str]:
     if has_file_attachments or has_item_attachments or has_link_attachments:
         features.add("regular-attachments")
 
-    if _dir_has_entries(os.path.join(message_dir, "inline"), want_files=True):
+    if _has_dir(entries, "inline") and _dir_has_entries(
+        entries["inline"].path, want_files=True
+    ):
         features.add("inline-attachments")
 
     return features
 
 
+def _index_entry(message_dir: str) -> Dict[str, object]:
+    features = sorted(_features_for_message_dir(message_dir))
+    return {
+        "path": message_dir,
+        "features": features,
+    }
+
+
 def _build_index(base_dir: str) -> List[Dict[str, object]]:
     message_dirs = _collect_message_dirs(base_dir)
-    entries: List[Dict[str, object]] = []
-    for message_dir in message_dirs:
-        features = sorted(_features_for_message_dir(message_dir))
-        entries.append({"path": message_dir, "features": features})
-    return entries
+    # Feature detection is a few scandir calls per message, which release the
+    # GIL, so it overlaps well across threads; map keeps the scan order
+    with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as executor:
+        return list(executor.map(_index_entry, message_dirs))
 
 
 def _write_index(entries: List[Dict[str, object]], path: str) -> None:
@@ -129,17 +186,13 @@ def _write_index(entries: List[Dict[str, object]], path: str) -> None:
         "generatedAt": datetime.now(timezone.utc).isoformat(),
         "messages": entries,
     }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+    write_json(path, payload, indent=True)
 
 
 def _load_index(path: str) -> Optional[List[Dict[str, object]]]:
-    if not os.path.isfile(path):
-        return None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except (OSError, json.JSONDecodeError):
+        data = read_json(path)
+    except (OSError, ValueError):
         return None
     if not isinstance(data, dict):
         return None
@@ -149,6 +202,21 @@ def _load_index(path: str) -> Optional[List[Dict[str, object]]]:
     return messages
 
 
+def _entry_feature_masks(entries: List[Dict[str, object]]) -> List[Tuple[str, int]]:
+    # Masks are derived from the stored feature names on load, never stored:
+    # FEATURE_BITS shifts whenever a feature is added, so saved bits would go stale
+    feature_masks: List[Tuple[str, int]] = []
+    for entry in entries:
+        path = entry.get("path")
+        if not isinstance(path, str):
+            continue
+        entry_features = entry.get("features")
+        if not isinstance(entry_features, list):
+            entry_features = []
+        feature_masks.append((path, _feature_mask(entry_features)))
+    return feature_masks
+
+
 def impl_outlook_debug_download(raw_features: Iterable[str], build_index: bool) -> int:
     if not os.path.isdir(CACHE_ROOT):
         print(colored("Missing .dsed/caches. Run outlook download first.", "red"))
@@ -170,18 +238,17 @@ def impl_outlook_debug_download(raw_features: Iterable[str], build_index: bool)
     if entries is None:
         entries = _build_index(CACHE_ROOT)
 
-    matches: List[str] = []
-    for entry in entries:
-        path = entry.get("path")
-        entry_features = entry.get("features")
-        if not isinstance(path, str):
-            continue
-        if not isinstance(entry_features, list):
-            entry_features = []
-        entry_set = {str(item) for item in entry_features}
-        if features and not features.issubset(entry_set):
-            continue
-        matches.append(path)
+    if features:
+        want = _feature_mask(features)
+        matches = [
+            path
+            for path, bits in _entry_feature_masks(entries)
+            if bits & want == want
+        ]
+    else:
+        matches = [
+            entry["path"] for entry in entries if isinstance(entry.get("path"), str)
+        ]
 
     if not matches:
         print("no messages with requested features")
@@ -3,9 +3,9 @@ from termcolor import colored
 from pysrc.helpers.outlook.downloading import download_all_folders
 
 
-def impl_outlook_download(reset=False):
+def impl_outlook_download(reset=False, force=False):
     try:
-        return download_all_folders(reset=reset)
+        return download_all_folders(reset=reset, force=force)
     except KeyboardInterrupt:
         print(colored("Process aborted by user.", "red"))
         return -1
@@ -1,11 +1,17 @@
 import os
-import shutil
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from termcolor import colored
 
-from pysrc.call_route import call_route
+from pysrc.call_route import SESSION, call_route
+from pysrc.helpers.folders import iter_folder_paths
+from pysrc.utils.json_io import write_json_if_changed
+from pysrc.utils.load_json_cached import load_json_cached
+from pysrc.utils.trash import reap_trash, trash_dir
 from pysrc.helpers.outlook.indexing import (
+    INDEX_MAX_WORKERS,
+    index_folder_get_folder_metadata,
     index_folder_get_top_level_ids,
     index_folder_sanity_check,
     index_folder_get_top_level_metadata,
@@ -13,16 +19,78 @@ from pysrc.helpers.outlook.indexing import (
 )
 
 
+# Index directories already created by this process, so repeat runs skip the
+# makedirs stat chain; cleared on reset, which trashes everything in it
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path):
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+def _run_folders_parallel(folders, fn, label, stop_event, failure_message=None):
+    """
+    Run fn(folder_name, node) for every folder on INDEX_MAX_WORKERS threads.
+    Returns False (after cancelling pending folders) as soon as one fails.
+    stop_event: threading.Event that fn passes on to the indexing helpers; set
+    on the first failure or Ctrl+C so folders already running return at their
+    next page or chunk instead of holding up the return
+    failure_message: printed before the failed folder's name; omit when fn
+    reports its own failures
+    """
+    print_lock = threading.Lock()
+
+    def run(i, folder_name, node):
+        # A folder picked up just as the run was stopped is not started
+        if stop_event.is_set():
+            return False
+        with print_lock:
+            print(f"{label} for Folder {i+1}/{len(folders)}: {folder_name}")
+        return fn(folder_name, node)
+
+    executor = ThreadPoolExecutor(max_workers=INDEX_MAX_WORKERS)
+    wait = True
+    try:
+        futures = {
+            executor.submit(run, i, folder_name, node): folder_name
+            for i, (folder_name, node) in enumerate(folders)
+        }
+        for future in as_completed(futures):
+            if not future.result():
+                stop_event.set()
+                if failure_message:
+                    with print_lock:
+                        print(colored(f"{failure_message} {futures[future]}", "red"))
+                return False
+        return True
+    except KeyboardInterrupt:
+        # cancel_futures only drops folders that haven't started, and the
+        # interpreter still joins running workers at exit; the stop flag makes
+        # those return after the request they are waiting on
+        stop_event.set()
+        wait = False
+        raise
+    finally:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
 def impl_outlook_index(reset=False):
+    # Large indexes are slow to unlink file by file, so reset moves the tree
+    # aside and deletes it in the background; leftovers are reaped next run
+    reap_trash(".dsed/index")
     if reset:
-        if os.path.isdir(".dsed/index"):
-            shutil.rmtree(".dsed/index")
-        os.makedirs(".dsed/index", exist_ok=True)
+        trash_dir(".dsed/index")
+        _ENSURED_DIRS.clear()
+        _ensure_dir(".dsed/index")
         print(colored("Index reset. Deleted all index files.", "green"))
         return 0
     try:
 
-        if not os.path.isfile(".dsed/index/folders.json"):
+        try:
+            folder_data = load_json_cached(".dsed/index/folders.json")
+        except FileNotFoundError:
             resp_folders = call_route(
                 "/outlook/indexing/get-folders", "Fetching folder info..."
             )
@@ -31,105 +99,138 @@ def impl_outlook_index(reset=False):
             folder_data = resp_folders.data
             if folder_data is None:
                 folder_data = []
-        else:
-            with open(".dsed/index/folders.json", "r", encoding="utf-8") as f:
-                folder_data = json.load(f)
 
         from pysrc.helpers.shortcodes import (
             apply_folder_shortcodes,
-            build_shortcode_map,
             collect_folder_nodes,
-            write_shortcode_map,
+            load_or_build_shortcode_map,
         )
 
         nodes = collect_folder_nodes(folder_data)
         folder_ids = [node.get("id") for node in nodes if node.get("id")]
-        id_to_shortcode, shortcode_to_id, length = build_shortcode_map(folder_ids)
-        apply_folder_shortcodes(folder_data, id_to_shortcode)
-        write_shortcode_map(
-            ".dsed/index/shortcodes/folders.json",
-            id_to_shortcode,
-            shortcode_to_id,
-            length,
+        id_to_shortcode, _, _ = load_or_build_shortcode_map(
+            ".dsed/index/shortcodes/folders.json", folder_ids
         )
+        apply_folder_shortcodes(folder_data, id_to_shortcode)
 
-        with open(".dsed/index/folders.json", "w", encoding="utf-8") as f:
-            f.write(json.dumps(folder_data, indent=2))
-            print(
-                colored(
-                    "Folder information saved to.dsed/index/folders.json", "green"
-                )
+        write_json_if_changed(".dsed/index/folders.json", folder_data)
+        print(
+            colored(
+                "Folder information saved to.dsed/index/folders.json", "green"
             )
+        )
 
-        os.makedirs(".dsed/index/top-level-messages", exist_ok=True)
-
-        folders = []
-
-        def recursion(node, prior):
-            folders.append(("\u2192".join(prior + (node["name"],)), node))
-            for child in node["children"]:
-                recursion(child, prior + (node["name"],))
+        _ensure_dir(".dsed/index/top-level-messages")
+        top_level_existing = set(os.listdir(".dsed/index/top-level-messages"))
 
-        for folder in folder_data:
-            recursion(folder, tuple())
+        folders = list(iter_folder_paths(folder_data))
 
         print(f"Found {len(folders)} folders:")
         for folder_name, _ in folders:
             print("\t" + folder_name)
 
-        print("Getting top level message IDs...")
-
-        for i, (folder_name, node) in enumerate(folders):
-            print(
-                f"Getting Top Level IDs for Folder {i+1}/{len(folders)}: {folder_name}"
+        # The phases are pipelined per folder around the sanity gate: each
+        # folder's count check is fetched as soon as its IDs are in, and each
+        # folder is organized as soon as its metadata is hydrated. Sanity stays
+        # an all-folders gate so nothing is hydrated from a suspect index.
+        print("Getting top level message IDs and folder counts...")
+
+        # Shared by both parallel phases so Ctrl+C ends whichever is running
+        stop_event = threading.Event()
+        folder_metadata = {}
+
+        def get_ids_and_counts(folder_name, node):
+            if not index_folder_get_top_level_ids(
+                node,
+                quiet=True,
+                existing_files=top_level_existing,
+                session=SESSION,
+                stop_event=stop_event,
+            ):
+                return False
+            if stop_event.is_set():
+                return False
+            folder_metadata[node["id"]] = index_folder_get_folder_metadata(
+                node, quiet=True, session=SESSION
             )
+            return True
 
-            if not index_folder_get_top_level_ids(node):
-                print(colored(f"Failed to get top level IDs for {folder_name}", "red"))
-                return -1
+        if not _run_folders_parallel(
+            folders,
+            get_ids_and_counts,
+            "Getting Top Level IDs",
+            stop_event,
+            "Failed to get top level IDs for",
+        ):
+            return -1
 
         print(colored("All folders top-level-indexed successfully.", "green"))
 
         print("Performing sanity checks...")
 
+        sanity_failures = []
         for i, (folder_name, node) in enumerate(folders):
             print(f"Sanity Check for Folder {i+1}/{len(folders)}: {folder_name}")
 
-            if not index_folder_sanity_check(node):
+            metadata = folder_metadata.get(node["id"])
+            if metadata is None or not index_folder_sanity_check(node, metadata):
                 print(colored(f"Sanity check failed for {folder_name}", "red"))
-                return -1
-
-        print("Fetching top-level message metadata...")
-
-        os.makedirs(".dsed/index/top-level-message-metadata", exist_ok=True)
+                sanity_failures.append(folder_name)
 
-        for i, (folder_name, node) in enumerate(folders):
+        if sanity_failures:
             print(
-                f"Fetching Top Level Metadata for Folder {i+1}/{len(folders)}: {folder_name}"
-            )
-
-            if not index_folder_get_top_level_metadata(folder_name, node):
-                print(
-                    colored(
-                        f"Failed to fetch top level metadata for {folder_name}", "red"
-                    )
+                colored(
+                    f"Sanity checks failed for {len(sanity_failures)}/{len(folders)} folders.",
+                    "red",
                 )
-                return -1
-
-        print("Organizing into conversations...")
-
-        for i, (folder_name, node) in enumerate(folders):
-            print(
-                f"Organizing into Conversations for Folder {i+1}/{len(folders)}: {folder_name}"
             )
-            if not index_folder_organize_into_conversations(folder_name, node):
+            return -1
+
+        print("Fetching top-level message metadata and organizing into conversations...")
+
+        _ensure_dir(".dsed/index/top-level-message-metadata")
+        _ensure_dir(".dsed/index/conversations-organized")
+        # Listed once up front so folders finished by an earlier run are
+        # skipped without a stat each; files are only ever added during a run
+        metadata_existing = set(os.listdir(".dsed/index/top-level-message-metadata"))
+        organized_existing = set(os.listdir(".dsed/index/conversations-organized"))
+
+        def hydrate_and_organize(folder_name, node):
+            if not index_folder_get_top_level_metadata(
+                folder_name,
+                node,
+                quiet=True,
+                session=SESSION,
+                existing_files=metadata_existing,
+                stop_event=stop_event,
+            ):
+                if not stop_event.is_set():
+                    print(
+                        colored(
+                            f"Failed to fetch top level metadata for {folder_name}",
+                            "red",
+                        )
+                    )
+                return False
+            if not index_folder_organize_into_conversations(
+                folder_name, node, existing_files=organized_existing
+            ):
                 print(
                     colored(
                         f"Failed to organize into conversations for {folder_name}",
                         "red",
                     )
                 )
-                return -1
+                return False
+            return True
+
+        if not _run_folders_parallel(
+            folders,
+            hydrate_and_organize,
+            "Fetching Metadata and Organizing Conversations",
+            stop_event,
+        ):
+            return -1
 
         return 0
 
@@ -1,19 +1,69 @@
-import json
 from time import sleep
 import webbrowser
 import os
 
-import requests
 from termcolor import colored
 
 
 from pysrc.utils.summarize_response import summarize_response
-from pysrc.call_route import call_route
+from pysrc.call_route import (
+    API_BASE_URL,
+    JWT_PATH,
+    MUTATING_SESSION,
+    SESSION,
+    _clear_jwt_cache,
+    _spinner_line,
+    call_route,
+)
+from pysrc.utils.json_io import write_json
+
+POLL_INTERVAL_INITIAL = 0.3
+POLL_INTERVAL_MAX = 3.0
+POLL_INTERVAL_GROWTH = 1.5
+CHECK_PENDING_LOGIN_URL = f"{API_BASE_URL}auth/outlook/check-pending-login"
+
+
+def _retry_after_seconds(raw_resp, default):
+    value = raw_resp.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        return default
+    # Never poll back-to-back, and never stall longer than the backoff cap
+    return min(max(seconds, POLL_INTERVAL_INITIAL), POLL_INTERVAL_MAX)
+
+
+def _poll_pending_login(poll_token):
+    """
+    Poll check-pending-login until it stops answering 403 (not logged in yet)
+    and return that response. The spinner animates on the shared spinner
+    thread, so its cadence is independent of the poll interval.
+    """
+    poll_interval = POLL_INTERVAL_INITIAL
+    delay = poll_interval
+    with _spinner_line("Waiting for login..."):
+        while True:
+            sleep(delay)
+            # Not retried inside urllib3, whose Retry-After waits are uncapped;
+            # throttling is handled by this loop's own clamped backoff
+            raw_resp = MUTATING_SESSION.post(
+                CHECK_PENDING_LOGIN_URL,
+                json=poll_token,
+            )
+            resp = summarize_response(raw_resp)
+            if resp.ok or resp.status != 403:
+                return resp
+            # Back off while the user is still completing login in the browser;
+            # a Retry-After only sets the next sleep, not the backoff itself
+            poll_interval = min(poll_interval * POLL_INTERVAL_GROWTH, POLL_INTERVAL_MAX)
+            delay = _retry_after_seconds(raw_resp, poll_interval)
 
 
 def impl_outlook_login():
     resp = summarize_response(
-        requests.get("http://localhost:3000/api/auth/outlook/get-url")
+        SESSION.get(f"{API_BASE_URL}auth/outlook/get-url")
     )
 
     if not resp.ok:
@@ -45,59 +95,38 @@ def impl_outlook_login():
 
     print("")
 
-    login_complete = False
-
-    anim_index = 0
-
-    anims = ["/", "-", "\\", "|"]
-
     try:
-        while not login_complete:
-            print("\r", end="")
-            print(anims[anim_index], end="")
-            anim_index = (anim_index + 1) % len(anims)
-            sleep(0.2)
-            resp = summarize_response(
-                requests.post(
-                    "http://localhost:3000/api/auth/outlook/check-pending-login",
-                    json=poll_token,
-                )
-            )
-            if resp.ok:
-                login_complete = True
-                if not resp.data:
-                    print(
-                        colored(
-                            "Got successful HTTP status but invalid response body.",
-                            "red",
-                        )
-                    )
-                    return -1
-                if not isinstance(resp.data, dict):
-                    print(
-                        colored(
-                            "Got successful HTTP status but invalid response data.",
-                            "red",
-                        )
-                    )
-                    return -1
-
-                print(colored("\nLogin successful!", "green"))
-
-                os.makedirs(".dsed", exist_ok=True)
-                with open(".dsed/jwt.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(resp.data))
-                    print(colored("JWT saved to .dsed/jwt.json", "green"))
-            else:
-                if resp.status != 403:  # 403 is known error case -> not logged in yet
-                    print(
-                        colored(
-                            f"Unexpected error response (status={resp.status}):", "red"
-                        )
-                    )
-                    return -1
-        return 0
+        resp = _poll_pending_login(poll_token)
     except KeyboardInterrupt:
         print("")
         print("Login cancelled by user.")
         return -1
+
+    if not resp.ok:
+        print(colored(f"\nUnexpected error response (status={resp.status}):", "red"))
+        return -1
+    if not resp.data:
+        print(
+            colored(
+                "Got successful HTTP status but invalid response body.",
+                "red",
+            )
+        )
+        return -1
+    if not isinstance(resp.data, dict):
+        print(
+            colored(
+                "Got successful HTTP status but invalid response data.",
+                "red",
+            )
+        )
+        return -1
+
+    print(colored("\nLogin successful!", "green"))
+
+    os.makedirs(".dsed", exist_ok=True)
+    write_json(JWT_PATH, resp.data)
+    # The token is cached per process; make the next call pick up the new one
+    _clear_jwt_cache()
+    print(colored(f"JWT saved to {JWT_PATH}", "green"))
+    return 0
@@ -1,27 +1,20 @@
-import json
 import os
 
-import requests
 from termcolor import colored
 
-from pysrc.call_route import BASE_URL, JWT_PATH
+from pysrc.call_route import API_BASE_URL, JWT_PATH, MUTATING_SESSION
+from pysrc.utils.json_io import read_json
 from pysrc.utils.summarize_response import summarize_response
 
 
 def _load_jwt(jwt_path: str):
-    if not os.path.exists(jwt_path):
-        return None
     try:
-        with open(jwt_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data.get("jwt")
+        return read_json(jwt_path).get("jwt")
     except Exception:
         return None
 
 
 def _delete_local_jwt(jwt_path: str):
-    if not os.path.exists(jwt_path):
-        return False
     try:
         os.remove(jwt_path)
         return True
@@ -32,10 +25,10 @@ def _delete_local_jwt(jwt_path: str):
 def impl_outlook_logout():
     jwt = _load_jwt(JWT_PATH)
     if jwt:
-        url = f"{BASE_URL.rstrip('/')}/api/auth/outlook/logout"
+        url = f"{API_BASE_URL}auth/outlook/logout"
         headers = {"Authorization": f"Bearer {jwt}"}
         resp = summarize_response(
-            requests.post(url, headers=headers, timeout=30)
+            MUTATING_SESSION.post(url, headers=headers, timeout=30)
         )
         if resp.ok:
             print(colored("Server session cleared.", "green"))
@@ -2,32 +2,34 @@ from termcolor import colored
 
 from pysrc.call_route import call_route
 
+GRAPH_TOKEN_DISPLAY_KEYS = ("aud", "appid", "tid", "oid", "iss", "version", "expiresAtUtc")
+
+
 def impl_outlook_me():
     resp = call_route("/outlook/me", "Fetching user info...")
     if resp is None:
         return -1
-    print(colored("\nUser information:", "green"))
     user_data = resp.data or {}
     graph_token = user_data.pop("graphAccessToken", None)
-    for key, value in user_data.items():
-        print(f"{key}: {value}")
+    lines = [colored("\nUser information:", "green")]
+    lines.extend(f"{key}: {value}" for key, value in user_data.items())
     if isinstance(graph_token, dict):
         scopes = graph_token.get("scopes") or []
         roles = graph_token.get("roles") or []
-        print(colored("\nGraph access token:", "cyan"))
+        lines.append(colored("\nGraph access token:", "cyan"))
         if scopes:
-            print("scopes:")
-            for item in scopes:
-                print(f"  - {item}")
+            lines.append("scopes:")
+            lines.extend(f"  - {item}" for item in scopes)
         else:
-            print("scopes: (none)")
+            lines.append("scopes: (none)")
         if roles:
-            print("roles:")
-            for item in roles:
-                print(f"  - {item}")
+            lines.append("roles:")
+            lines.extend(f"  - {item}" for item in roles)
         else:
-            print("roles: (none)")
-        for key in ["aud", "appid", "tid", "oid", "iss", "version", "expiresAtUtc"]:
-            if graph_token.get(key):
-                print(f"{key}: {graph_token.get(key)}")
+            lines.append("roles: (none)")
+        for key in GRAPH_TOKEN_DISPLAY_KEYS:
+            value = graph_token.get(key)
+            if value:
+                lines.append(f"{key}: {value}")
+    print("\n".join(lines))
     return 0
@@ -3,9 +3,13 @@ from termcolor import colored
 from pysrc.helpers.outlook.outputting import export_outlook_output
 
 
-def impl_outlook_output(outdir: str, max_subject_chars: int = 36) -> int:
+def impl_outlook_output(
+    outdir: str, max_subject_chars: int = 36, hardlink: bool = False
+) -> int:
     try:
-        return export_outlook_output(outdir, max_subject_chars=max_subject_chars)
+        return export_outlook_output(
+            outdir, max_subject_chars=max_subject_chars, hardlink=hardlink
+        )
     except KeyboardInterrupt:
         print(colored("Process aborted by user.", "red"))
         return -1
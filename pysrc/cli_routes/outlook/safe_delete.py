@@ -1,9 +1,11 @@
 import click
 from termcolor import colored
+from operator import itemgetter
 import shutil
 import textwrap
 
-from pysrc.call_route import call_route
+from pysrc.call_route import MUTATING_SESSION, call_route
+from pysrc.utils.color_wrapper import color_wrapper
 
 
 def _stringify_preview(text):
@@ -12,9 +14,15 @@ def _stringify_preview(text):
     return " ".join(text.splitlines()).strip()
 
 
-def _sender_display(msg):
-    sender = msg.get("from") or {}
-    email = sender.get("emailAddress") or {}
+# The find route always returns these keys (null when Graph omits them)
+_preview_fields = itemgetter("from", "subject", "bodyPreview")
+_message_id = itemgetter("id")
+_cyan = color_wrapper("cyan")
+_yellow = color_wrapper("yellow")
+
+
+def _sender_display(sender):
+    email = (sender or {}).get("emailAddress") or {}
     address = email.get("address") or ""
     name = email.get("name") or ""
     if name and address:
@@ -26,18 +34,20 @@ def _wrap_width():
     return max(40, int(cols * 0.85))
 
 
-def _wrap_with_prefix(prefix, text, width):
-    if not text:
-        return ""
-    subsequent = " " * len(prefix)
-    return textwrap.fill(
-        text,
+def _prefixed_wrapper(prefix, width):
+    return textwrap.TextWrapper(
         width=width,
         initial_indent=prefix,
-        subsequent_indent=subsequent,
+        subsequent_indent=" " * len(prefix),
     )
 
 
+def _wrap_with_prefix(prefix, text, width, wrapper=None):
+    if not text:
+        return ""
+    return (wrapper or _prefixed_wrapper(prefix, width)).fill(text)
+
+
 def impl_outlook_safe_delete(
     exact_sender,
     exact_subject,
@@ -105,20 +115,35 @@ def impl_outlook_safe_delete(
     print(colored(f"Showing first {preview_count} preview(s):", "cyan"))
 
     width = _wrap_width()
-    for i, msg in enumerate(matches[:preview_count]):
-        sender_display = _sender_display(msg)
-        subject = msg.get("subject") or ""
-        preview = _stringify_preview(msg.get("bodyPreview") or "")
-        sender_line = _wrap_with_prefix(f"{i+1}. Sender: ", sender_display, width)
-        subject_line = _wrap_with_prefix("   Subject: ", subject, width)
-        preview_line = _wrap_with_prefix("   Preview: ", preview, width)
+    # The subject/preview prefixes never change, so build their wrappers once
+    # and emit the whole preview block with a single print
+    subject_wrapper = _prefixed_wrapper("   Subject: ", width)
+    preview_wrapper = _prefixed_wrapper("   Preview: ", width)
+    lines = []
+    for i, (sender, subject, body_preview) in enumerate(
+        map(_preview_fields, matches[:preview_count])
+    ):
+        sender_line = _wrap_with_prefix(
+            f"{i+1}. Sender: ", _sender_display(sender), width
+        )
+        subject_line = _wrap_with_prefix(
+            "   Subject: ", subject or "", width, subject_wrapper
+        )
+        preview_line = _wrap_with_prefix(
+            "   Preview: ",
+            _stringify_preview(body_preview or ""),
+            width,
+            preview_wrapper,
+        )
         if sender_line:
-            print(colored(sender_line, "cyan"))
+            lines.append(_cyan(sender_line))
         if subject_line:
-            print(colored(subject_line, "yellow"))
+            lines.append(_yellow(subject_line))
         if preview_line:
-            print(preview_line)
-        print()
+            lines.append(preview_line)
+        lines.append("")
+    if lines:
+        print("\n".join(lines))
 
     remaining = total - preview_count
     if remaining > 0:
@@ -141,9 +166,10 @@ def impl_outlook_safe_delete(
         "/outlook/safe-delete/delete",
         "Deleting messages..." if not soft else "Moving messages to trash...",
         json_body={
-            "messageIds": [m.get("id") for m in matches if m.get("id")],
+            "messageIds": list(filter(None, map(_message_id, matches))),
             "soft": soft,
         },
+        session=MUTATING_SESSION,
     )
     if delete_resp is None:
         return -1
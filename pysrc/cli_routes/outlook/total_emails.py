@@ -1,21 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from termcolor import colored
 
-from pysrc.call_route import call_route
+from pysrc.call_route import SESSION, call_route
+from pysrc.helpers.folders import iter_folder_paths
+from pysrc.utils.color_wrapper import color_wrapper
 
 
-def _flatten_folders(folder_forest):
-    folders = []
+# Folder count requests are independent; this bounds how many are in flight
+TOTAL_EMAILS_MAX_WORKERS = 8
+
 
-    def recursion(node, prior):
-        path = " -> ".join(prior + (node["name"],))
-        folders.append((path, node))
-        for child in node.get("children", []):
-            recursion(child, prior + (node["name"],))
+def _flatten_folders(folder_forest):
+    return list(iter_folder_paths(folder_forest, separator=" -> "))
 
-    for folder in folder_forest:
-        recursion(folder, tuple())
 
-    return folders
+_COLORS = {
+    color: color_wrapper(color)
+    for color in ("red", "yellow", "green", "cyan", "magenta", "blue")
+}
 
 
 def _count_color(count):
@@ -46,19 +49,29 @@ def impl_outlook_total_emails():
         print(colored("No folders found.", "red"))
         return -1
 
-    rows = []
-    total = 0
-    for i, (folder_path, node) in enumerate(folders):
-        folder_id = node.get("id")
-        if not folder_id:
+    for folder_path, node in folders:
+        if not node.get("id"):
             print(colored(f"Missing folder id for {folder_path}", "red"))
             return -1
 
-        resp_meta = call_route(
+    def fetch_counts(item):
+        i, (folder_path, node) = item
+        return call_route(
             "/outlook/indexing/get-folder-metadata",
             f"Fetching counts {i+1}/{len(folders)}: {folder_path}",
-            json_body={"folderId": folder_id},
+            json_body={"folderId": node["id"]},
+            quiet=True,
+            session=SESSION,
         )
+
+    print(f"Fetching counts for {len(folders)} folders...")
+    with ThreadPoolExecutor(max_workers=TOTAL_EMAILS_MAX_WORKERS) as executor:
+        responses = list(executor.map(fetch_counts, enumerate(folders)))
+
+    rows = []
+    total = 0
+    width = len("Folder")
+    for (folder_path, _), resp_meta in zip(folders, responses):
         if resp_meta is None:
             return -1
 
@@ -67,20 +80,18 @@ def impl_outlook_total_emails():
         if isinstance(count, int):
             total += count
         rows.append((folder_path, count))
+        width = max(width, len(folder_path))
 
-    width = max(len("Folder"), max(len(path) for path, _ in rows))
-    header = f"{'Folder':<{width}}  {'Count':>10}"
-    print("\n" + colored(header, "green"))
-    print(colored("-" * (width + 12), "green"))
-
+    # Pad before coloring so f-string alignment isn't thrown off by ANSI codes
+    rule = colored("-" * (width + 12), "green")
+    lines = ["", colored(f"{'Folder':<{width}}  {'Count':>10}", "green"), rule]
     for folder_path, count in rows:
         count_display = "?" if count is None else f"{count}"
-        print(
-            colored(folder_path, "blue")
-            + " " * (width - len(folder_path) + 2)
-            + colored(f"{count_display:>10}", _count_color(count))
+        lines.append(
+            _COLORS["blue"](f"{folder_path:<{width}}  ")
+            + _COLORS[_count_color(count)](f"{count_display:>10}")
         )
-
-    print(colored("-" * (width + 12), "green"))
-    print(colored(f"{'TOTAL':<{width}}  {total:>10}", "green"))
+    lines.append(rule)
+    lines.append(colored(f"{'TOTAL':<{width}}  {total:>10}", "green"))
+    print("\n".join(lines))
     return 0
@@ -0,0 +1,24 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def iter_folder_paths(
+    folder_forest: List[Dict[str, Any]], separator: str = "\u2192"
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (display_path, node) for every folder, depth-first in pre-order.
+    Uses an explicit stack, and each node's path extends its parent's
+    already-joined path, so deep trees cost neither recursion nor re-joins.
+    """
+    stack: List[Tuple[Dict[str, Any], Optional[str]]] = [
+        (root, None) for root in reversed(folder_forest)
+    ]
+    while stack:
+        node, parent_path = stack.pop()
+        path = (
+            node["name"]
+            if parent_path is None
+            else f"{parent_path}{separator}{node['name']}"
+        )
+        yield path, node
+        for child in reversed(node.get("children", [])):
+            stack.append((child, path))
@@ -1,23 +1,66 @@
 import base64
-import json
 import mimetypes
 import os
-import shutil
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-import requests
 from termcolor import colored
 from tqdm import tqdm
 
-from pysrc.call_route import BASE_URL, _load_jwt
+from pysrc.call_route import (
+    API_BASE_URL,
+    SESSION,
+    _auth_headers,
+    _clear_jwt_cache,
+    _load_jwt,
+)
+from pysrc.helpers.folders import iter_folder_paths
 from pysrc.helpers.shortcodes import (
     apply_folder_shortcodes,
     build_shortcode_map,
     collect_folder_nodes,
-    write_shortcode_map,
+    load_or_build_shortcode_map,
+    reuse_or_build_shortcode_map,
+)
+from pysrc.utils.json_io import (
+    json_dumps,
+    read_json,
+    write_json,
+    write_json_atomic,
+    write_json_if_changed,
 )
+from pysrc.utils.load_json_cached import load_json_cached
 from pysrc.utils.summarize_response import summarize_response
+from pysrc.utils.trash import reap_trash, trash_dir
+from pysrc.utils.zstd_text import write_text_compressed
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - regex fallback
+    ahocorasick = None
+
+# Messages are exported concurrently within a folder; keep this at or below
+# the shared session's connection pool size
+DOWNLOAD_MAX_WORKERS = 8
+# Written into a message's cache dir once it is fully exported. Bump the
+# version when the export layout changes so older caches are re-exported.
+COMPLETE_MARKER = ".complete"
+CACHE_LAYOUT_VERSION = 2
+# Read size when streaming attachment/item bodies to disk
+BINARY_CHUNK_SIZE = 1 << 20
+_O_BINARY = getattr(os, "O_BINARY", 0)
+# Shared by all message workers for per-attachment requests. Attachment tasks
+# never wait on other tasks, so message workers can block on them safely;
+# DOWNLOAD_MAX_WORKERS + ATTACHMENT_FETCH_WORKERS stays within the session pool
+ATTACHMENT_FETCH_WORKERS = 4
+_ATTACHMENT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=ATTACHMENT_FETCH_WORKERS, thread_name_prefix="dsed-attachment"
+)
+# Bodies with more inline references than this are rewritten with an
+# Aho-Corasick automaton (when pyahocorasick is installed) instead of a regex
+INLINE_REWRITE_AUTOMATON_MIN_KEYS = 8
 
 
 def _api_request_json(
@@ -30,9 +73,9 @@ def _api_request_json(
     jwt = _load_jwt()
     if not jwt:
         return None
-    url = f"{BASE_URL.rstrip('/')}/api/{route.lstrip('/')}"
-    headers = {"Authorization": f"Bearer {jwt}"}
-    resp = requests.request(
+    url = API_BASE_URL + route.lstrip("/")
+    headers = _auth_headers(jwt)
+    resp = SESSION.request(
         method,
         url,
         headers=headers,
@@ -42,6 +85,9 @@ def _api_request_json(
     )
     summary = summarize_response(resp)
     if not summary.ok:
+        if summary.status == 401:
+            # Re-read the JWT file next call in case the user logged in again
+            _clear_jwt_cache()
         print(colored(f"Request failed: {route} ({summary.status})", "red"))
         if summary.text:
             print(summary.text)
@@ -49,26 +95,54 @@ def _api_request_json(
     return summary.data
 
 
-def _api_request_binary(
+def _api_request_binary_to_file(
     route: str,
+    disk_path: str,
     params: Optional[Dict[str, Any]] = None,
     timeout: int = 60,
-) -> Optional[Tuple[bytes, str]]:
+) -> Optional[Tuple[str, int]]:
+    """
+    Stream a binary response straight into disk_path, so memory use doesn't
+    grow with attachment size. The body lands in <disk_path>.part first and is
+    renamed into place once complete. Returns (content_type, bytes_written).
+    """
     jwt = _load_jwt()
     if not jwt:
         return None
-    url = f"{BASE_URL.rstrip('/')}/api/{route.lstrip('/')}"
-    headers = {"Authorization": f"Bearer {jwt}"}
-    resp = requests.get(url, headers=headers, params=params or None, timeout=timeout)
-    if not resp.ok:
-        print(
-            colored(
-                f"Binary request failed: {route} ({resp.status_code})", "red"
+    url = API_BASE_URL + route.lstrip("/")
+    headers = _auth_headers(jwt)
+    with SESSION.get(
+        url, headers=headers, params=params or None, timeout=timeout, stream=True
+    ) as resp:
+        if not resp.ok:
+            if resp.status_code == 401:
+                _clear_jwt_cache()
+            print(
+                colored(
+                    f"Binary request failed: {route} ({resp.status_code})", "red"
+                )
             )
-        )
-        return None
-    content_type = resp.headers.get("Content-Type", "application/octet-stream")
-    return resp.content, content_type
+            return None
+        content_type = resp.headers.get("Content-Type", "application/octet-stream")
+        part_path = f"{disk_path}.part"
+        written = 0
+        with open(part_path, "wb") as f:
+            for chunk in resp.iter_content(chunk_size=BINARY_CHUNK_SIZE):
+                f.write(chunk)
+                written += len(chunk)
+    os.replace(part_path, disk_path)
+    return content_type, written
+
+
+_RE_WHITESPACE = re.compile(r"\s+")
+_RE_UNSAFE_CHARS = re.compile(r"[^a-z0-9._-]")
+_RE_UNDERSCORE_RUNS = re.compile(r"_+")
+
+
+@lru_cache(maxsize=256)
+def _guess_extension(content_type: str) -> Optional[str]:
+    # Most attachments share a handful of content types
+    return mimetypes.guess_extension(content_type)
 
 
 def _sanitize_filename(name: Optional[str], content_type: Optional[str]) -> str:
@@ -79,7 +153,7 @@ def _sanitize_filename(name: Optional[str], content_type: Optional[str]) -> str:
     base, ext = os.path.splitext(raw)
     base = base.strip() or "attachment"
 
-    guessed_ext = mimetypes.guess_extension(content_type or "") if content_type else None
+    guessed_ext = _guess_extension(content_type) if content_type else None
     if not ext and guessed_ext:
         ext = guessed_ext
     if not ext:
@@ -90,32 +164,89 @@ def _sanitize_filename(name: Optional[str], content_type: Optional[str]) -> str:
         ext = "." + ext
 
     base = base.lower()
-    base = re.sub(r"\s+", "_", base)
-    base = re.sub(r"[^a-z0-9._-]", "_", base)
-    base = re.sub(r"_+", "_", base).strip("._-")
+    base = _RE_WHITESPACE.sub("_", base)
+    base = _RE_UNSAFE_CHARS.sub("_", base)
+    base = _RE_UNDERSCORE_RUNS.sub("_", base).strip("._-")
     if not base:
         base = "attachment"
 
     return f"{base}{ext}"
 
 
+# Directories already created this run; conversation and attachment dirs are
+# ensured repeatedly, and each makedirs is at least one stat. Set membership
+# and add are atomic under the GIL and makedirs(exist_ok=True) tolerates a
+# racing worker, so no lock is needed
+_ENSURED_DIRS: Set[str] = set()
+
+
 def _ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
 
 
+# Cache files are written beside their path and renamed over it rather than
+# truncated in place, so an output file hardlinked to the old one keeps its
+# contents (see outlook output --hardlink)
 def _write_json(path: str, data: Any) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    part_path = f"{path}.part"
+    with open(part_path, "wb") as f:
+        f.write(json_dumps(data, indent=True))
+    os.replace(part_path, path)
 
 
 def _write_text(path: str, data: str) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(data)
-
-
-def _write_binary(path: str, data: bytes) -> None:
-    with open(path, "wb") as f:
+    part_path = f"{path}.part"
+    with open(part_path, "w", encoding="utf-8") as f:
         f.write(data)
+    os.replace(part_path, path)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _decode_base64_chunks(encoded: str) -> Iterator[bytes]:
+    # Whole 4-character quanta per slice, so each slice decodes on its own
+    step = BINARY_CHUNK_SIZE // 3 * 4
+    for start in range(0, len(encoded), step):
+        yield base64.b64decode(encoded[start : start + step], validate=True)
+
+
+def _write_base64(path: str, encoded: str) -> bool:
+    """
+    Decode base64 contentBytes into path one BINARY_CHUNK_SIZE piece at a
+    time, so the decoded attachment is never held in memory whole. The file
+    lands in <path>.part and is renamed into place once complete. Returns
+    False, leaving nothing behind, if the value can't be decoded.
+    """
+    part_path = f"{path}.part"
+    # Raw fd rather than open(): no buffer object or tty probe per attachment
+    fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o644)
+    decoded = False
+    try:
+        try:
+            for chunk in _decode_base64_chunks(encoded):
+                _write_all(fd, chunk)
+        except ValueError:
+            # Strict slices reject whitespace and other input b64decode
+            # tolerates; redo it as one lenient decode of the whole value
+            os.ftruncate(fd, 0)
+            os.lseek(fd, 0, os.SEEK_SET)
+            _write_all(fd, base64.b64decode(encoded))
+        decoded = True
+    except (ValueError, TypeError):
+        pass
+    finally:
+        os.close(fd)
+    if not decoded:
+        os.remove(part_path)
+        return False
+    os.replace(part_path, path)
+    return True
 
 
 def _normalize_cid(cid: Optional[str]) -> Optional[str]:
@@ -132,19 +263,48 @@ def _rewrite_inline_html(
     cid_map: Dict[str, str],
     location_map: Dict[str, str],
 ) -> Tuple[str, bool]:
-    rewritten = html
-    for cid, rel_path in cid_map.items():
-        if not cid:
-            continue
-        rewritten = rewritten.replace(f"cid:{cid}", rel_path)
-        rewritten = rewritten.replace(f"cid:<{cid}>", rel_path)
+    lookup: Dict[str, str] = {}
     for loc, rel_path in location_map.items():
-        if not loc:
-            continue
-        rewritten = rewritten.replace(loc, rel_path)
+        if loc:
+            lookup[loc] = rel_path
+    for cid, rel_path in cid_map.items():
+        if cid:
+            lookup[f"cid:{cid}"] = rel_path
+            lookup[f"cid:<{cid}>"] = rel_path
+    if not lookup:
+        return html, False
+    if ahocorasick is not None and len(lookup) > INLINE_REWRITE_AUTOMATON_MIN_KEYS:
+        rewritten = _rewrite_with_automaton(html, lookup)
+        return rewritten, rewritten != html
+    # One scan over the body for all references; longest keys first so a cid
+    # that prefixes another (cid:a vs cid:ab) can't clip the longer one
+    pattern = re.compile(
+        "|".join(re.escape(key) for key in sorted(lookup, key=len, reverse=True))
+    )
+    rewritten = pattern.sub(lambda m: lookup[m.group(0)], html)
     return rewritten, rewritten != html
 
 
+def _rewrite_with_automaton(html: str, lookup: Dict[str, str]) -> str:
+    automaton = ahocorasick.Automaton()
+    for key, rel_path in lookup.items():
+        automaton.add_word(key, (len(key), rel_path))
+    automaton.make_automaton()
+    # iter_long yields leftmost-longest, non-overlapping matches, the same
+    # choice the longest-first regex alternation makes
+    pieces: List[str] = []
+    pos = 0
+    for end, (key_len, rel_path) in automaton.iter_long(html):
+        start = end - key_len + 1
+        pieces.append(html[pos:start])
+        pieces.append(rel_path)
+        pos = end + 1
+    if not pieces:
+        return html
+    pieces.append(html[pos:])
+    return "".join(pieces)
+
+
 def _get_message(message_id: str) -> Optional[Dict[str, Any]]:
     return _api_request_json(
         "/outlook/download/get-message", params={"messageId": message_id}
@@ -169,22 +329,55 @@ def _get_attachment_with_item(
     )
 
 
-def _get_attachment_value(
-    message_id: str, attachment_id: str
-) -> Optional[Tuple[bytes, str]]:
-    return _api_request_binary(
+def _save_attachment_value(
+    message_id: str, attachment_id: str, disk_path: str
+) -> Optional[Tuple[str, int]]:
+    return _api_request_binary_to_file(
         "/outlook/download/get-attachment-value",
+        disk_path,
         params={"messageId": message_id, "attachmentId": attachment_id},
     )
 
 
-def _get_item_value(item_type: str, item_id: str) -> Optional[Tuple[bytes, str]]:
-    return _api_request_binary(
+def _save_item_value(
+    item_type: str, item_id: str, disk_path: str
+) -> Optional[Tuple[str, int]]:
+    return _api_request_binary_to_file(
         "/outlook/download/get-item-value",
+        disk_path,
         params={"itemType": item_type, "itemId": item_id},
     )
 
 
+_RE_ATTACHMENT_TYPE = re.compile(r"fileAttachment|referenceAttachment|itemAttachment")
+
+
+# Graph only sends a handful of distinct @odata.type strings
+@lru_cache(maxsize=64)
+def _classify_odata_type(odata_type: str) -> str:
+    match = _RE_ATTACHMENT_TYPE.search(odata_type)
+    return match.group(0) if match else "unknown"
+
+
+# Graph omits some of these per attachment type, so they are read with .get
+_ATTACHMENT_FIELDS = (
+    "id",
+    "isInline",
+    "name",
+    "contentType",
+    "size",
+    "contentId",
+    "contentLocation",
+)
+
+
+def _attachment_type(att: Dict[str, Any]) -> str:
+    odata_type = att.get("@odata.type") or att.get("odataType")
+    if isinstance(odata_type, str):
+        return _classify_odata_type(odata_type)
+    return "unknown"
+
+
 def _export_body_files(
     body_obj: Optional[Dict[str, Any]],
     message_dir: str,
@@ -200,15 +393,18 @@ def _export_body_files(
         return
 
     ext = "html" if content_type == "html" else "txt"
-    target_path = os.path.join(message_dir, f"{basename}.{ext}")
+    target_path = f"{message_dir}/{basename}.{ext}"
     original_content = content
 
     if inline_maps and content_type == "html":
         cid_map, location_map = inline_maps
         rewritten, changed = _rewrite_inline_html(content, cid_map, location_map)
         if changed:
-            no_parse_path = os.path.join(message_dir, f"{basename}_noParse.html")
-            _write_text(no_parse_path, original_content)
+            # Rarely-read backup of the original markup; stored compressed
+            # (when zstandard is installed) and expanded again by output
+            write_text_compressed(
+                f"{message_dir}/{basename}_noParse.html", original_content
+            )
             content = rewritten
 
     _write_text(target_path, content)
@@ -225,24 +421,20 @@ def _message_for_json(message: Dict[str, Any]) -> Dict[str, Any]:
     return message_json
 
 
-def _export_event_item(item: Dict[str, Any], base_dir: str) -> None:
-    _write_json(os.path.join(base_dir, "event.json"), item)
+def _export_event_item(item: Dict[str, Any], base_dir: str) -> bool:
+    _write_json(f"{base_dir}/event.json", item)
     item_id = item.get("id")
     if item_id:
-        value = _get_item_value("event", item_id)
-        if value:
-            data, _content_type = value
-            _write_binary(os.path.join(base_dir, "event.ics"), data)
+        return _save_item_value("event", item_id, f"{base_dir}/event.ics") is not None
+    return True
 
 
-def _export_contact_item(item: Dict[str, Any], base_dir: str) -> None:
-    _write_json(os.path.join(base_dir, "contact.json"), item)
+def _export_contact_item(item: Dict[str, Any], base_dir: str) -> bool:
+    _write_json(f"{base_dir}/contact.json", item)
     item_id = item.get("id")
     if item_id:
-        value = _get_item_value("contact", item_id)
-        if value:
-            data, _content_type = value
-            _write_binary(os.path.join(base_dir, "contact.vcf"), data)
+        return _save_item_value("contact", item_id, f"{base_dir}/contact.vcf") is not None
+    return True
 
 
 def _export_message_from_data(
@@ -250,72 +442,91 @@ def _export_message_from_data(
     message_dir: str,
     message_id: Optional[str],
     allow_graph_attachments: bool,
-) -> None:
+    force: bool = False,
+) -> bool:
+    """
+    Export message into message_dir. Returns False if any part of it could not
+    be fetched (attachment list, attachment or item bodies, nested items);
+    everything that could be is still written, but the caller must not treat
+    the message as finished.
+    force: re-fetch attachment bodies even when a previous run left them on disk
+    """
     _ensure_dir(message_dir)
-    attachments_dir = os.path.join(message_dir, "attachments")
-    attachments_files_dir = os.path.join(attachments_dir, "files")
-    attachments_links_dir = os.path.join(attachments_dir, "links")
-    attachments_items_dir = os.path.join(attachments_dir, "items")
-    inline_dir = os.path.join(message_dir, "inline")
+    attachments_dir = f"{message_dir}/attachments"
+    attachments_files_dir = f"{attachments_dir}/files"
+    attachments_links_dir = f"{attachments_dir}/links"
+    attachments_items_dir = f"{attachments_dir}/items"
+    inline_dir = f"{message_dir}/inline"
 
-    _ensure_dir(attachments_files_dir)
-    _ensure_dir(attachments_links_dir)
-    _ensure_dir(attachments_items_dir)
-    _ensure_dir(inline_dir)
+    # Attachment subdirectories are created only when something is written to
+    # them, rather than leaving four empty directories in most messages
 
-    _write_json(os.path.join(message_dir, "message.json"), _message_for_json(message))
+    _write_json(f"{message_dir}/message.json", _message_for_json(message))
 
     inline_cid_map: Dict[str, str] = {}
     inline_location_map: Dict[str, str] = {}
     files_map: List[Dict[str, Any]] = []
 
+    ok = True
     attachments: List[Dict[str, Any]] = []
     if allow_graph_attachments and message_id:
         fetched = _get_attachments(message_id)
         if fetched is not None:
             attachments = fetched
+        else:
+            ok = False
     if not attachments and isinstance(message.get("attachments"), list):
         attachments = message["attachments"]
 
-    _write_json(os.path.join(message_dir, "attachments.json"), attachments)
+    _write_json(f"{message_dir}/attachments.json", attachments)
 
-    attachment_ids = [att.get("id") for att in attachments if att.get("id")]
+    # build_shortcode_map skips missing ids itself
     (
         attachment_id_to_shortcode,
         attachment_shortcode_to_id,
         attachment_shortcode_length,
-    ) = build_shortcode_map(attachment_ids)
-
-    for att in attachments:
-        attachment_id = att.get("id")
+    ) = build_shortcode_map(att.get("id") for att in attachments)
+    # Classified once; both passes below branch on it
+    typed_attachments = [(att, _attachment_type(att)) for att in attachments]
+
+    # Attachment requests are independent, so item details are requested up
+    # front and file bodies are streamed in the background; results are still
+    # consumed in attachment order below, so the layout is unchanged
+    detail_futures: Dict[str, Future] = {}
+    if message_id:
+        for att, attachment_type in typed_attachments:
+            attachment_id = att.get("id")
+            if attachment_id and attachment_type == "itemAttachment":
+                detail_futures[attachment_id] = _ATTACHMENT_EXECUTOR.submit(
+                    _get_attachment_with_item, message_id, attachment_id
+                )
+    file_futures: List[Future] = []
+
+    for att, attachment_type in typed_attachments:
+        (
+            attachment_id,
+            is_inline,
+            original_name,
+            content_type,
+            size,
+            content_id,
+            content_location,
+        ) = map(att.get, _ATTACHMENT_FIELDS)
         attachment_shortcode = (
             attachment_id_to_shortcode.get(attachment_id) if attachment_id else None
         )
         if attachment_id and not attachment_shortcode:
             raise ValueError(f"Missing shortcode for attachment id {attachment_id}")
-        odata_type = att.get("@odata.type") or att.get("odataType")
-        is_inline = bool(att.get("isInline"))
-        original_name = att.get("name")
-        content_type = att.get("contentType")
-        size = att.get("size")
-        content_id = _normalize_cid(att.get("contentId"))
-        content_location = att.get("contentLocation")
-
-        attachment_type = "unknown"
-        if isinstance(odata_type, str):
-            if "fileAttachment" in odata_type:
-                attachment_type = "fileAttachment"
-            elif "referenceAttachment" in odata_type:
-                attachment_type = "referenceAttachment"
-            elif "itemAttachment" in odata_type:
-                attachment_type = "itemAttachment"
+        is_inline = bool(is_inline)
+        content_id = _normalize_cid(content_id)
 
         sanitized_name = _sanitize_filename(original_name, content_type)
 
         if attachment_type == "referenceAttachment":
             if attachment_id:
+                _ensure_dir(attachments_links_dir)
                 _write_json(
-                    os.path.join(attachments_links_dir, f"{attachment_shortcode}.json"), att
+                    f"{attachments_links_dir}/{attachment_shortcode}.json", att
                 )
             files_map.append(
                 {
@@ -340,22 +551,25 @@ def _export_message_from_data(
             filename = f"{attachment_shortcode}{sanitized_name}"
             if is_inline:
                 rel_path = f"inline/{filename}"
-                disk_path = os.path.join(inline_dir, filename)
+                disk_path = f"{inline_dir}/{filename}"
             else:
                 rel_path = f"attachments/files/{filename}"
-                disk_path = os.path.join(attachments_files_dir, filename)
-
-            blob: Optional[Tuple[bytes, str]] = None
-            if att.get("contentBytes"):
-                try:
-                    blob = (base64.b64decode(att["contentBytes"]), content_type or "")
-                except Exception:
-                    blob = None
-            if blob is None and message_id:
-                blob = _get_attachment_value(message_id, attachment_id)
-            if blob:
-                data, _ct = blob
-                _write_binary(disk_path, data)
+                disk_path = f"{attachments_files_dir}/{filename}"
+            _ensure_dir(os.path.dirname(disk_path))
+
+            content_bytes = att.get("contentBytes")
+            if content_bytes and _write_base64(disk_path, content_bytes):
+                pass
+            elif not force and os.path.isfile(disk_path):
+                # Streamed bodies are renamed into place only once complete,
+                # so an existing file is a finished download from a prior run
+                pass
+            elif message_id:
+                file_futures.append(
+                    _ATTACHMENT_EXECUTOR.submit(
+                        _save_attachment_value, message_id, attachment_id, disk_path
+                    )
+                )
 
             if is_inline:
                 if content_id:
@@ -383,14 +597,16 @@ def _export_message_from_data(
         if attachment_type == "itemAttachment":
             if not attachment_id:
                 continue
-            item_dir = os.path.join(attachments_items_dir, attachment_shortcode)
+            item_dir = f"{attachments_items_dir}/{attachment_shortcode}"
             _ensure_dir(item_dir)
             detail = None
-            if message_id:
-                detail = _get_attachment_with_item(message_id, attachment_id)
+            if attachment_id in detail_futures:
+                detail = detail_futures[attachment_id].result()
+                if detail is None:
+                    ok = False
             if detail is None:
                 detail = att
-            _write_json(os.path.join(item_dir, "attachment.json"), detail)
+            _write_json(f"{item_dir}/attachment.json", detail)
 
             item = None
             if isinstance(detail, dict):
@@ -399,18 +615,21 @@ def _export_message_from_data(
             if item:
                 item_type = item.get("@odata.type", "")
                 if "message" in item_type:
-                    _export_message_from_data(
+                    item_ok = _export_message_from_data(
                         item,
                         item_dir,
                         item.get("id"),
                         allow_graph_attachments=True,
+                        force=force,
                     )
                 elif "event" in item_type:
-                    _export_event_item(item, item_dir)
+                    item_ok = _export_event_item(item, item_dir)
                 elif "contact" in item_type:
-                    _export_contact_item(item, item_dir)
+                    item_ok = _export_contact_item(item, item_dir)
                 else:
-                    _write_json(os.path.join(item_dir, "item.json"), item)
+                    _write_json(f"{item_dir}/item.json", item)
+                    item_ok = True
+                ok = ok and item_ok
 
             files_map.append(
                 {
@@ -429,50 +648,104 @@ def _export_message_from_data(
             )
             continue
 
+    # Wait for every streamed body; one that failed leaves the message unfinished
+    for future in file_futures:
+        if future.result() is None:
+            ok = False
+
     _write_json(
-        os.path.join(message_dir, "attachment_shortcodes.json"),
+        f"{message_dir}/attachment_shortcodes.json",
         {
             "shortcodeLength": attachment_shortcode_length,
             "shortcodeToId": attachment_shortcode_to_id,
         },
     )
 
-    _write_json(os.path.join(message_dir, "files_map.json"), files_map)
+    _write_json(f"{message_dir}/files_map.json", files_map)
 
     inline_maps = (inline_cid_map, inline_location_map)
     _export_body_files(message.get("body"), message_dir, "body", inline_maps)
     _export_body_files(message.get("uniqueBody"), message_dir, "uniqueBody", inline_maps)
+    return ok
 
 
-def _export_message_by_id(message_id: str, message_dir: str) -> bool:
+def _is_message_complete(message_dir: str) -> bool:
+    try:
+        marker = read_json(f"{message_dir}/{COMPLETE_MARKER}")
+    except (OSError, ValueError):
+        return False
+    return isinstance(marker, dict) and marker.get("version") == CACHE_LAYOUT_VERSION
+
+
+def _export_message_by_id(
+    message_id: str, message_dir: str, force: bool = False
+) -> Optional[bool]:
+    """
+    Export one message into message_dir. Returns True once every part is on
+    disk, False if the message was written but some part (an attachment body,
+    item detail or value) failed, and None if the message itself could not be
+    fetched.
+    """
+    # A rerun after a failure only fetches messages that never finished
+    if not force and _is_message_complete(message_dir):
+        return True
     message = _get_message(message_id)
     if message is None:
+        return None
+    if not _export_message_from_data(message, message_dir, message_id, True, force):
+        # No marker, so the next run fetches this message again
         return False
-    _export_message_from_data(message, message_dir, message_id, True)
+    write_json_atomic(
+        f"{message_dir}/{COMPLETE_MARKER}",
+        {"version": CACHE_LAYOUT_VERSION},
+    )
     return True
 
 
+def _export_messages_parallel(
+    tasks: List[Tuple[str, str]],
+    pbar: tqdm,
+    executor: ThreadPoolExecutor,
+    force: bool = False,
+) -> Tuple[Optional[str], List[str]]:
+    """
+    Export (message_id, message_dir) pairs on executor, advancing pbar per
+    message. Returns the first message id that could not be fetched (exports
+    not yet started are cancelled) or None, along with the ids of messages
+    exported only partially, which are left unmarked for the next run.
+    """
+    futures = {
+        executor.submit(_export_message_by_id, message_id, msg_dir, force): message_id
+        for message_id, msg_dir in tasks
+    }
+    incomplete: List[str] = []
+    try:
+        for future in as_completed(futures):
+            result = future.result()
+            if result is None:
+                return futures[future], incomplete
+            if not result:
+                incomplete.append(futures[future])
+            pbar.update(1)
+        return None, incomplete
+    finally:
+        # The executor outlives this folder, so drop whatever is still queued
+        for future in futures:
+            future.cancel()
+
+
 def _load_folder_forest() -> Optional[List[Dict[str, Any]]]:
-    if not os.path.isfile(".dsed/index/folders.json"):
+    try:
+        return load_json_cached(".dsed/index/folders.json")
+    except FileNotFoundError:
         print(colored("Missing .dsed/index/folders.json. Run indexing first.", "red"))
         return None
-    with open(".dsed/index/folders.json", "r", encoding="utf-8") as f:
-        return json.load(f)
 
 
 def _collect_folders_in_order(
     forest: List[Dict[str, Any]],
 ) -> List[Tuple[str, Dict[str, Any]]]:
-    folders: List[Tuple[str, Dict[str, Any]]] = []
-
-    def recursion(node: Dict[str, Any], prior: Tuple[str, ...]) -> None:
-        folders.append(("\u2192".join(prior + (node["name"],)), node))
-        for child in node.get("children", []):
-            recursion(child, prior + (node["name"],))
-
-    for root in forest:
-        recursion(root, tuple())
-    return folders
+    return list(iter_folder_paths(forest))
 
 
 def _load_conversations(
@@ -480,26 +753,28 @@ def _load_conversations(
 ) -> Optional[Tuple[Dict[str, Any], str]]:
     new_path = f".dsed/index/conversations-organized/{folder_shortcode}.json"
     old_path = f".dsed/index/conversations-organized/{folder_id}.json"
-    if not os.path.isfile(new_path) and os.path.isfile(old_path):
-        with open(old_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    # Open directly rather than stat-ing both names first; the id-named file
+    # is only consulted (and migrated) when the shortcode-named one is missing
+    try:
+        data = read_json(new_path)
+    except FileNotFoundError:
+        try:
+            data = read_json(old_path)
+        except FileNotFoundError:
+            print(
+                colored(
+                    f"Missing conversation index for folder {folder_id}. Run indexing first.",
+                    "red",
+                )
+            )
+            return None
         if isinstance(data, list):
             data = {
                 "folderId": folder_id,
                 "folderShortcode": folder_shortcode,
                 "conversations": data,
             }
-        _write_json(new_path, data)
-    if not os.path.isfile(new_path):
-        print(
-            colored(
-                f"Missing conversation index for folder {folder_id}. Run indexing first.",
-                "red",
-            )
-        )
-        return None
-    with open(new_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+        write_json(new_path, data)
     if isinstance(data, list):
         data = {
             "folderId": folder_id,
@@ -517,8 +792,11 @@ def _ensure_conversation_shortcodes(
         return []
 
     conversation_ids = [c.get("conversationId") for c in conversations if c.get("conversationId")]
-    conv_id_to_shortcode, conv_shortcode_to_id, conv_length = build_shortcode_map(
-        conversation_ids
+    # On reruns the maps saved by the previous run still match, so nothing is rehashed
+    conv_id_to_shortcode, conv_shortcode_to_id, conv_length = reuse_or_build_shortcode_map(
+        conversation_ids,
+        data.get("conversationShortcodes"),
+        data.get("conversationShortcodeLength"),
     )
 
     changed = False
@@ -533,8 +811,10 @@ def _ensure_conversation_shortcodes(
         if not isinstance(messages, list):
             continue
         message_ids = [m.get("id") for m in messages if m.get("id")]
-        msg_id_to_shortcode, msg_shortcode_to_id, msg_length = build_shortcode_map(
-            message_ids
+        msg_id_to_shortcode, msg_shortcode_to_id, msg_length = reuse_or_build_shortcode_map(
+            message_ids,
+            conversation.get("messageShortcodes"),
+            conversation.get("messageShortcodeLength"),
         )
         if conversation.get("messageShortcodes") != msg_shortcode_to_id:
             conversation["messageShortcodes"] = msg_shortcode_to_id
@@ -555,7 +835,7 @@ def _ensure_conversation_shortcodes(
         changed = True
 
     if changed:
-        _write_json(index_path, data)
+        write_json(index_path, data)
 
     return conversations
 
@@ -563,21 +843,34 @@ def _ensure_conversation_shortcodes(
 def _ensure_folder_shortcodes(folder_forest: List[Dict[str, Any]]) -> None:
     nodes = collect_folder_nodes(folder_forest)
     folder_ids = [node.get("id") for node in nodes if node.get("id")]
-    id_to_shortcode, shortcode_to_id, length = build_shortcode_map(folder_ids)
-    apply_folder_shortcodes(folder_forest, id_to_shortcode)
-    write_shortcode_map(
-        ".dsed/index/shortcodes/folders.json",
-        id_to_shortcode,
-        shortcode_to_id,
-        length,
+    id_to_shortcode, _, _ = load_or_build_shortcode_map(
+        ".dsed/index/shortcodes/folders.json", folder_ids
     )
+    apply_folder_shortcodes(folder_forest, id_to_shortcode)
 
 
-def download_all_folders(reset: bool = False) -> int:
+def download_all_folders(
+    reset: bool = False,
+    executor: Optional[ThreadPoolExecutor] = None,
+    force: bool = False,
+) -> int:
+    """
+    Export every indexed folder into .dsed/caches. Messages are exported on
+    executor when one is given (the caller keeps ownership of it); otherwise a
+    pool of DOWNLOAD_MAX_WORKERS threads is created for the run.
+
+    Messages finished by an earlier run are skipped unless force is set.
+    Messages only partially exported don't stop the run; they are listed at
+    the end and the run returns non-zero so the next one retries them.
+    """
+    # Same trash-and-reap approach as the index reset; caches hold every
+    # downloaded message and attachment, so they are the bigger tree to unlink
+    reap_trash(".dsed/caches")
     if reset:
-        if os.path.isdir(".dsed/caches"):
-            shutil.rmtree(".dsed/caches")
-        os.makedirs(".dsed/caches")
+        trash_dir(".dsed/caches")
+        # Everything remembered as created lived under the trashed tree
+        _ENSURED_DIRS.clear()
+        os.makedirs(".dsed/caches", exist_ok=True)
         return 0
 
     forest = _load_folder_forest()
@@ -585,7 +878,7 @@ def download_all_folders(reset: bool = False) -> int:
         return -1
 
     _ensure_folder_shortcodes(forest)
-    _write_json(".dsed/index/folders.json", forest)
+    write_json_if_changed(".dsed/index/folders.json", forest)
     folders = _collect_folders_in_order(forest)
     if not folders:
         print(colored("No folders found.", "red"))
@@ -593,6 +886,66 @@ def download_all_folders(reset: bool = False) -> int:
 
     os.makedirs(".dsed/caches", exist_ok=True)
 
+    # One pool serves every folder, so workers and their connections are not
+    # torn down and rebuilt between folders
+    owns_executor = executor is None
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=DOWNLOAD_MAX_WORKERS, thread_name_prefix="dsed-download"
+        )
+    wait = True
+    try:
+        return _download_folders(folders, executor, force)
+    except KeyboardInterrupt:
+        # Don't block Ctrl+C on exports still in flight
+        wait = False
+        raise
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _plan_folder_tasks(
+    conversations: List[Dict[str, Any]], folder_cache_dir: str
+) -> Tuple[List[Tuple[str, str]], int, int]:
+    """
+    Lay out conversation/message directories for a folder and return the
+    (message_id, message_dir) export tasks, the folder's message count and how
+    many of those messages were skipped for lacking an id or shortcode.
+    """
+    tasks: List[Tuple[str, str]] = []
+    total_items = 0
+    skipped = 0
+    for conversation in conversations:
+        messages = conversation.get("messages", [])
+        total_items += len(messages)
+        conversation_id = conversation.get("conversationId")
+        conversation_shortcode = conversation.get("conversationShortcode")
+        if not conversation_id or not conversation_shortcode:
+            continue
+        conv_dir = os.path.join(folder_cache_dir, conversation_shortcode)
+        _ensure_dir(conv_dir)
+
+        for message_meta in messages:
+            message_id = message_meta.get("id")
+            message_shortcode = message_meta.get("shortcode")
+            if not message_id or not message_shortcode:
+                skipped += 1
+                continue
+
+            msg_dir = os.path.join(conv_dir, message_shortcode)
+            _ensure_dir(msg_dir)
+            tasks.append((message_id, msg_dir))
+    return tasks, total_items, skipped
+
+
+def _download_folders(
+    folders: List[Tuple[str, Dict[str, Any]]],
+    executor: ThreadPoolExecutor,
+    force: bool,
+) -> int:
+    # Partial exports don't stop the pass; they are reported once it finishes
+    incomplete: List[Tuple[str, str]] = []
     for i, (folder_name, node) in enumerate(folders):
         folder_id = node["id"]
         folder_shortcode = node.get("shortcode")
@@ -610,37 +963,40 @@ def download_all_folders(reset: bool = False) -> int:
         folder_cache_dir = os.path.join(".dsed/caches", folder_shortcode)
         _ensure_dir(folder_cache_dir)
 
-        total_items = sum(len(c.get("messages", [])) for c in conversations)
+        # Directories are laid out here; workers only fetch and write
+        tasks, total_items, skipped = _plan_folder_tasks(conversations, folder_cache_dir)
+        # The task list is all the export needs, so don't keep a large folder's
+        # parsed index alive for the whole (network-bound) export
+        del loaded, conversations_data, conversations
+
         desc = f"Processing folder {folder_name} (folder {i+1}/{len(folders)})."
         with tqdm(total=total_items, desc=desc) as pbar:
-            for conversation in conversations:
-                conversation_id = conversation.get("conversationId")
-                conversation_shortcode = conversation.get("conversationShortcode")
-                if not conversation_id or not conversation_shortcode:
-                    continue
-                conv_dir = os.path.join(folder_cache_dir, conversation_shortcode)
-                _ensure_dir(conv_dir)
-
-                for message_meta in conversation.get("messages", []):
-                    message_id = message_meta.get("id")
-                    message_shortcode = message_meta.get("shortcode")
-                    if not message_id or not message_shortcode:
-                        pbar.update(1)
-                        continue
-
-                    msg_dir = os.path.join(conv_dir, message_shortcode)
-                    _ensure_dir(msg_dir)
-
-                    ok = _export_message_by_id(message_id, msg_dir)
-                    if not ok:
-                        print(
-                            colored(
-                                f"Failed to export message {message_id} in folder {folder_name}",
-                                "red",
-                            )
-                        )
-                        return -1
-                    pbar.update(1)
+            if skipped:
+                pbar.update(skipped)
+            failed_id, folder_incomplete = _export_messages_parallel(
+                tasks, pbar, executor, force
+            )
+            if failed_id is not None:
+                print(
+                    colored(
+                        f"Failed to export message {failed_id} in folder {folder_name}",
+                        "red",
+                    )
+                )
+                return -1
+        incomplete.extend((folder_name, message_id) for message_id in folder_incomplete)
+
+    if incomplete:
+        print(
+            colored(
+                f"{len(incomplete)} message(s) were only partially exported "
+                "and will be retried on the next run:",
+                "yellow",
+            )
+        )
+        for folder_name, message_id in incomplete:
+            print(f"  {folder_name}: {message_id}")
+        return -1
 
     print(colored("Download complete.", "green"))
     return 0
@@ -1,107 +1,309 @@
 import os
-import json
 import base64
-import binascii
+from collections import defaultdict, deque
+from operator import itemgetter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, List, Optional, Tuple
 
 from termcolor import colored
 
-from pysrc.call_route import call_route
+from pysrc.call_route import call_route, call_route_ndjson
 from pysrc.helpers.shortcodes import build_shortcode_map
+from pysrc.utils.json_io import (
+    read_json,
+    write_json,
+    write_json_atomic,
+    write_json_with_streamed_list,
+)
 
 INDEX_SANITY_CHECK_MAX_DISCREPANCY = 100
 INDEX_GET_METADATA_CHUNK_SIZE = 20
+INDEX_MAX_WORKERS = 8
+# Metadata chunks are hydrated on one pool shared by every folder, so the
+# number of hydrate requests in flight stays bounded however many folders
+# run at once; each folder keeps at most INDEX_METADATA_WINDOW chunks queued
+INDEX_METADATA_MAX_WORKERS = 8
+INDEX_METADATA_WINDOW = 2 * INDEX_METADATA_MAX_WORKERS
+_METADATA_EXECUTOR = ThreadPoolExecutor(
+    max_workers=INDEX_METADATA_MAX_WORKERS, thread_name_prefix="dsed-metadata"
+)
+# Print discovery progress after at least this many new IDs, not every page
+INDEX_PROGRESS_PRINT_INTERVAL = 10_000
+INVALID_RESPONSE_DATA_MESSAGE = colored(
+    "Got successful HTTP status but invalid response data.", "red"
+)
 def _resolve_index_file(base_dir: str, folder_id: str, folder_shortcode: str) -> str:
-    os.makedirs(base_dir, exist_ok=True)
     new_path = os.path.join(base_dir, f"{folder_shortcode}.json")
+    # After the first run the shortcode-named file almost always exists, and
+    # then there is nothing to create or migrate: one stat and done
+    if os.path.isfile(new_path):
+        return new_path
+    os.makedirs(base_dir, exist_ok=True)
     old_path = os.path.join(base_dir, f"{folder_id}.json")
-    if not os.path.isfile(new_path) and os.path.isfile(old_path):
-        with open(old_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        with open(new_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    if os.path.isfile(old_path):
+        write_json(new_path, read_json(old_path))
     return new_path
 
+_URLSAFE_TO_STANDARD_B64 = str.maketrans("-_", "+/")
+
+
 def _decode_conversation_index(b64: str) -> bytes:
     """Decode Graph's Base64 conversationIndex to raw bytes; robust to missing padding."""
     if not b64:
         return b""
-    s = b64.strip()
+    # Some payloads might be URL-safe base64; mapping its two extra characters
+    # to the standard alphabet lets one decode handle both
+    s = b64.strip().translate(_URLSAFE_TO_STANDARD_B64)
     s += "=" * ((4 - (len(s) % 4)) % 4)
+    return base64.b64decode(s)
+
+
+def _conversation_message_sort_key(m):
+    # Called once per message by list.sort, so each conversationIndex is
+    # decoded exactly once. As a stable tie-breaker, use receivedEpoch
+    # (ascending = older first), then id to ensure deterministic ordering.
+    idx_bytes = _decode_conversation_index(m.get("conversationIndex", ""))
+    return (idx_bytes, m.get("receivedEpoch", 0), m.get("id", ""))
+
+
+def _top_level_ids_progress_paths(target_path: str) -> Tuple[str, str]:
+    base, _ext = os.path.splitext(target_path)
+    return f"{base}.partial.ids", f"{base}.cursor.json"
+
+
+def _load_top_level_ids_progress(
+    partial_path: str, cursor_path: str
+) -> Optional[Tuple[int, int, str]]:
+    """
+    Return (count, offset, next_link) left behind by an interrupted run,
+    or None if there is nothing usable to resume from.
+    """
     try:
-        return base64.b64decode(s)
-    except binascii.Error:
-        # Some payloads might be URL-safe base64
-        return base64.urlsafe_b64decode(s)
+        cursor = read_json(cursor_path)
+        partial_size = os.path.getsize(partial_path)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cursor, dict):
+        return None
+    count = cursor.get("count")
+    offset = cursor.get("offset")
+    next_link = cursor.get("nextLink")
+    if (
+        not isinstance(count, int)
+        or not isinstance(offset, int)
+        or not isinstance(next_link, str)
+        or not next_link
+        or offset > partial_size
+    ):
+        return None
+    return count, offset, next_link
+
+
+def _write_top_level_ids_cursor(
+    cursor_path: str, next_link: str, count: int, offset: int
+) -> None:
+    write_json(cursor_path, {"nextLink": next_link, "count": count, "offset": offset})
+
+
+def _finalize_top_level_ids(
+    partial_path: str, target_path: str, count: int, unique: bool
+) -> None:
+    # The finished sink becomes the id list as-is (one id per line); the .json
+    # file is only a small pointer to it, so nothing is re-encoded
+    base, _ext = os.path.splitext(target_path)
+    ids_path = f"{base}.ids"
+    os.replace(partial_path, ids_path)
+    write_json_atomic(
+        target_path,
+        {"idsFile": os.path.basename(ids_path), "count": count, "unique": unique},
+    )
+
+
+def _load_top_level_ids(path: str) -> List[str]:
+    """
+    Load a top-level message id list written by index_folder_get_top_level_ids.
+    Accepts the pointer format and legacy plain JSON arrays.
+    """
+    data = read_json(path)
+    if isinstance(data, dict) and isinstance(data.get("idsFile"), str):
+        ids_path = os.path.join(os.path.dirname(path), data["idsFile"])
+        with open(ids_path, "r", encoding="utf-8") as f:
+            return f.read().splitlines()
+    return data
+
+
+def _load_top_level_ids_summary(path: str) -> Tuple[int, bool]:
+    """
+    Return (count, unique) for a top-level id list. Pointer files record both
+    at indexing time; legacy arrays fall back to loading the list.
+    """
+    data = read_json(path)
+    if (
+        isinstance(data, dict)
+        and isinstance(data.get("count"), int)
+        and isinstance(data.get("unique"), bool)
+    ):
+        return data["count"], data["unique"]
+    message_ids = _load_top_level_ids(path)
+    return len(message_ids), _all_unique(message_ids)
+
+
+def _all_unique(values: List[str]) -> bool:
+    # Stops at the first repeat instead of hashing the whole list into a set
+    seen = set()
+    seen_add = seen.add
+    for value in values:
+        if value in seen:
+            return False
+        seen_add(value)
+    return True
 
 
-def index_folder_get_top_level_ids(node):
+def index_folder_get_top_level_ids(
+    node, quiet=False, existing_files=None, session=None, stop_event=None
+):
+    """
+    existing_files: optional set of file names already present in
+    .dsed/index/top-level-messages (one listdir per run instead of a stat per folder)
+    session: optional requests.Session to page on; defaults to the shared one
+    stop_event: optional threading.Event; once set, the stream is abandoned at
+    the next page (the cursor keeps what was already written) and False returned
+
+    IDs arrive as one streamed NDJSON record per Graph page and are appended,
+    one per line, to a .partial.ids sink alongside a cursor file, so an
+    interrupted run resumes from the last completed page. On completion the
+    sink becomes <shortcode>.ids and <shortcode>.json points at it.
+    """
     folder_id = node.get("id")
     folder_shortcode = node.get("shortcode")
     if not folder_id or not folder_shortcode:
         print(colored("Missing folder id or shortcode during indexing.", "red"))
         return False
+    if existing_files is not None and f"{folder_shortcode}.json" in existing_files:
+        return True
     target_path = _resolve_index_file(
         ".dsed/index/top-level-messages", folder_id, folder_shortcode
     )
-    if not os.path.isfile(target_path):
-        resp = call_route(
-            "/outlook/indexing/get-id-list",
-            "Fetching folder info...",
+    if os.path.isfile(target_path):
+        return True
+
+    partial_path, cursor_path = _top_level_ids_progress_paths(target_path)
+    progress = _load_top_level_ids_progress(partial_path, cursor_path)
+    # Duplicates are tracked as ids arrive so the sanity check never has to
+    # reload the list to check uniqueness
+    seen = set()
+    if progress is None:
+        count, offset, next_link = 0, 0, None
+    else:
+        count, offset, next_link = progress
+        print(f"Resuming {node['name']} from {count} previously discovered IDs...")
+        with open(partial_path, "rb") as f:
+            seen.update(f.read(offset).decode("utf-8").splitlines())
+
+    json_body = {"folderId": folder_id}
+    if next_link:
+        json_body["nextLink"] = next_link
+
+    completed = False
+    last_printed = count
+    seen_update = seen.update
+    # The sink is opened before the request so nothing can fail between
+    # receiving the streamed response and the finally that closes it
+    with open(partial_path, "r+b" if offset else "wb") as sink:
+        sink.seek(offset)
+        sink.truncate()
+        write = sink.write
+        records = call_route_ndjson(
+            "/outlook/indexing/stream-id-list",
+            "Streaming message IDs...",
             method="POST",
-            json_body={
-                "folderId": folder_id,
-            },
+            json_body=json_body,
+            quiet=quiet,
+            session=session,
         )
-        if resp is None:
-            return False
-        if not isinstance(resp.data, dict):
-            print(
-                colored(
-                    "Got successful HTTP status but invalid response data.",
-                    "red",
-                )
-            )
+        if records is None:
             return False
-        message_ids = resp.data["messageIds"]
-        print(f"Discovered {len(message_ids)} so far...")
-        next_link = resp.data.get("nextLink", None)
-        while next_link:
-            resp = call_route(
-                "/outlook/indexing/get-id-list",
-                "Fetching more message IDs...",
-                method="POST",
-                json_body={
-                    "folderId": node["id"],
-                    "nextLink": next_link,
-                },
-            )
-            if resp is None:
-                return False
-            if not isinstance(resp.data, dict):
-                print(
-                    colored(
-                        "Got successful HTTP status but invalid response data.",
-                        "red",
-                    )
-                )
-                return False
-            message_ids.extend(resp.data["messageIds"])
-            print(f"Discovered {len(message_ids)} so far...")
-            next_link = resp.data.get("nextLink", None)
-        with open(
-            target_path, "w", encoding="utf-8"
-        ) as f:
-            f.write(json.dumps(message_ids))
-            print(
-                colored(
-                    f"Indexed messages in folder {node['name']} ({folder_id}).",
-                    "green",
-                )
+        try:
+            for record in records:
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                if not isinstance(record, dict) or not isinstance(
+                    record.get("messageIds"), list
+                ):
+                    if isinstance(record, dict) and record.get("error"):
+                        print(colored(f"Request failed: {record['error']}", "red"))
+                        detail = record.get("text") or record.get("detail")
+                        if detail:
+                            print(detail)
+                    else:
+                        print(INVALID_RESPONSE_DATA_MESSAGE)
+                    return False
+                page_ids = record["messageIds"]
+                seen_update(page_ids)
+                if page_ids:
+                    write(("\n".join(page_ids) + "\n").encode("utf-8"))
+                    sink.flush()
+                count += len(page_ids)
+                offset = sink.tell()
+                next_link = record.get("nextLink", None)
+                if not quiet and (
+                    not next_link
+                    or count - last_printed >= INDEX_PROGRESS_PRINT_INTERVAL
+                ):
+                    print(f"Discovered {count} so far...")
+                    last_printed = count
+                if not next_link:
+                    completed = True
+                    # The sink is renamed into place next; make it durable first
+                    os.fsync(sink.fileno())
+                    break
+                _write_top_level_ids_cursor(cursor_path, next_link, count, offset)
+        finally:
+            records.close()
+
+    if not completed:
+        print(
+            colored(
+                f"Message ID stream for folder {node['name']} ended early; rerun to resume.",
+                "red",
             )
+        )
+        return False
+
+    _finalize_top_level_ids(partial_path, target_path, count, len(seen) == count)
+    try:
+        os.remove(cursor_path)
+    except FileNotFoundError:
+        pass
+    print(
+        colored(
+            f"Indexed messages in folder {node['name']} ({folder_id}).",
+            "green",
+        )
+    )
     return True
 
 
-def index_folder_sanity_check(node):
+def index_folder_get_folder_metadata(node, quiet=False, session=None):
+    """
+    Fetch the folder's Graph metadata (item counts) used by the sanity check.
+    Returns the call_route response, or None on failure.
+    """
+    return call_route(
+        "/outlook/indexing/get-folder-metadata",
+        "Fetching folder metadata...",
+        method="POST",
+        json_body={"folderId": node.get("id")},
+        quiet=quiet,
+        session=session,
+    )
+
+
+def index_folder_sanity_check(node, folder_metadata=None):
+    """
+    folder_metadata: optional response from index_folder_get_folder_metadata,
+    so callers can fetch metadata for many folders concurrently up front
+    """
     folder_id = node.get("id")
     folder_shortcode = node.get("shortcode")
     if not folder_id or not folder_shortcode:
@@ -110,7 +312,11 @@ def index_folder_sanity_check(node):
     top_level_messages_path = _resolve_index_file(
         ".dsed/index/top-level-messages", folder_id, folder_shortcode
     )
-    if not os.path.isfile(top_level_messages_path):
+    try:
+        indexedItemCount, ids_unique = _load_top_level_ids_summary(
+            top_level_messages_path
+        )
+    except FileNotFoundError:
         print(
             colored(
                 f"No top-level messages found in folder {node['name']} ({folder_id}). Fatal error.",
@@ -119,29 +325,16 @@ def index_folder_sanity_check(node):
         )
         print(colored("Check that previous steps ran correctly.", "red"))
         return False
-    folder_metadata = call_route(
-        "/outlook/indexing/get-folder-metadata",
-        "Fetching folder metadata...",
-        method="POST",
-        json_body={"folderId": folder_id},
-    )
+    if folder_metadata is None:
+        folder_metadata = index_folder_get_folder_metadata(node)
     if folder_metadata is None:
         return False
-    if (
-        not isinstance(folder_metadata.data, dict)
-        or not isinstance(folder_metadata.data["counts"], dict)
-        or not isinstance(folder_metadata.data["counts"]["totalItemCount"], int)
-    ):
-        print(
-            colored(
-                "Got successful HTTP status but invalid response data.",
-                "red",
-            )
-        )
-    totalItemCount = folder_metadata.data["counts"]["totalItemCount"]
-    with open(top_level_messages_path, "r", encoding="utf-8") as f:
-        message_ids = json.load(f)
-    indexedItemCount = len(message_ids)
+    data = folder_metadata.data
+    counts = data.get("counts") if isinstance(data, dict) else None
+    totalItemCount = counts.get("totalItemCount") if isinstance(counts, dict) else None
+    if not isinstance(totalItemCount, int):
+        print(INVALID_RESPONSE_DATA_MESSAGE)
+        return False
     print(f"Indexed: {indexedItemCount}\tTotal: {totalItemCount}")
     if indexedItemCount < totalItemCount:
         print(
@@ -160,8 +353,7 @@ def index_folder_sanity_check(node):
         )
         return False
     print("Checking id uniqueness...")
-    message_ids_set = set(message_ids)
-    if len(message_ids) != len(message_ids_set):
+    if not ids_unique:
         print(
             colored(
                 f"Error: Duplicated message IDs detected! This could indicate that emails have arrived or been moved in since indexing started.",
@@ -172,12 +364,41 @@ def index_folder_sanity_check(node):
     print("No duplicate message ids.")
     return True
 
-def index_folder_get_top_level_metadata(folder_name, node):
+
+def _hydrate_metadata_chunk(chunk_ids, session=None):
+    # Runs on the metadata pool next to other chunks, so no per-chunk spinner
+    return call_route(
+        "/outlook/indexing/hydrate-message-metadata",
+        "Fetching metadata for messages...",
+        method="POST",
+        json_body={
+            "ids": chunk_ids,
+            "includeHeaders": False,
+            "includeEpoch": True,
+        },
+        quiet=True,
+        session=session,
+    )
+
+
+def index_folder_get_top_level_metadata(
+    folder_name, node, quiet=False, session=None, existing_files=None, stop_event=None
+):
+    """
+    quiet: skip per-chunk progress and spinners (for concurrent callers)
+    existing_files: optional set of file names already present in
+    .dsed/index/top-level-message-metadata, as for index_folder_get_top_level_ids
+    session: optional requests.Session to hydrate on; defaults to the shared one
+    stop_event: optional threading.Event; once set, no further chunks are
+    waited on, the folder's queued chunks are cancelled and False returned
+    """
     folder_id = node.get("id")
     folder_shortcode = node.get("shortcode")
     if not folder_id or not folder_shortcode:
         print(colored("Missing folder id or shortcode for metadata.", "red"))
         return False
+    if existing_files is not None and f"{folder_shortcode}.json" in existing_files:
+        return True
     metadata_path = _resolve_index_file(
         ".dsed/index/top-level-message-metadata", folder_id, folder_shortcode
     )
@@ -185,144 +406,175 @@ def index_folder_get_top_level_metadata(folder_name, node):
         messages_path = _resolve_index_file(
             ".dsed/index/top-level-messages", folder_id, folder_shortcode
         )
-        if not os.path.isfile(messages_path):
+        try:
+            message_ids = _load_top_level_ids(messages_path)
+        except FileNotFoundError:
             print(colored(f"""\
 Top level message ID list missing for folder "{folder_name}", a previous step may have failed.
 Try resetting the index and running indexing again.
                           ""","red"))
             return False
-        with open(messages_path, "r", encoding="utf-8") as f:
-            message_ids = json.load(f)
-        message_ids_chunked = []
-
-        for i in range(0, len(message_ids), INDEX_GET_METADATA_CHUNK_SIZE):
-            message_ids_chunked.append(message_ids[i:i + INDEX_GET_METADATA_CHUNK_SIZE])
+        # Chunks are sliced as they are submitted, not materialized up front
+        chunk_size = INDEX_GET_METADATA_CHUNK_SIZE
+        total_chunks = (len(message_ids) + chunk_size - 1) // chunk_size
 
         all_message_metadata = {}
 
-        for chunk_index, chunk_ids in enumerate(message_ids_chunked):
-            print(f"Fetching metadata for chunk {chunk_index+1}/{len(message_ids_chunked)}...")
-
-            metadata_response = call_route("/outlook/indexing/hydrate-message-metadata", "Fetching metadata for messages...", method="POST", json_body={
-                "ids": chunk_ids,
-                "includeHeaders": False,
-                "includeEpoch": True,
-            })
-
-            if metadata_response is None:
-                return False
-            
-            if not isinstance(metadata_response.data, dict) or not isinstance(metadata_response.data["messages"], list):
-                print(colored("Got successful HTTP status but invalid response data.", "red"))
-                return False
-            
-            for message_id, message_metadata in zip(chunk_ids, metadata_response.data["messages"]):
-                all_message_metadata[message_id] = message_metadata
-            
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            f.write(json.dumps(all_message_metadata))
+        # Chunks are requested ahead on the shared pool but consumed in order,
+        # so the output keeps the id list's order and a failure stops the folder
+        window: Deque[Tuple[int, List[str], Future]] = deque()
+        chunk_iter = (
+            (chunk_index, message_ids[chunk_index * chunk_size:(chunk_index + 1) * chunk_size])
+            for chunk_index in range(total_chunks)
+        )
+        try:
+            while True:
+                for chunk_index, chunk_ids in chunk_iter:
+                    window.append(
+                        (
+                            chunk_index,
+                            chunk_ids,
+                            _METADATA_EXECUTOR.submit(
+                                _hydrate_metadata_chunk, chunk_ids, session
+                            ),
+                        )
+                    )
+                    if len(window) >= INDEX_METADATA_WINDOW:
+                        break
+                if not window:
+                    break
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                chunk_index, chunk_ids, future = window.popleft()
+                metadata_response = future.result()
+                if not quiet:
+                    print(f"Fetched metadata for chunk {chunk_index+1}/{total_chunks}.")
+
+                if metadata_response is None:
+                    return False
+
+                if not isinstance(metadata_response.data, dict) or not isinstance(metadata_response.data["messages"], list):
+                    print(INVALID_RESPONSE_DATA_MESSAGE)
+                    return False
+
+                all_message_metadata.update(zip(chunk_ids, metadata_response.data["messages"]))
+        finally:
+            # Don't leave this folder's queued chunks running after a failure
+            # or a stop
+            for _chunk_index, _chunk_ids, pending in window:
+                pending.cancel()
+
+        write_json(metadata_path, all_message_metadata)
 
         
     return True
 
 
-def index_folder_organize_into_conversations(folder_name, node):
+def index_folder_organize_into_conversations(folder_name, node, existing_files=None):
+    """
+    existing_files: optional set of file names already present in
+    .dsed/index/conversations-organized, as for index_folder_get_top_level_ids
+    """
     # 1) Load top-level metadata produced by an earlier step
     folder_id = node.get("id")
     folder_shortcode = node.get("shortcode")
     if not folder_id or not folder_shortcode:
         print(colored("Missing folder id or shortcode for conversations.", "red"))
         return False
+    if existing_files is not None and f"{folder_shortcode}.json" in existing_files:
+        return True
     input_path = _resolve_index_file(
         ".dsed/index/top-level-message-metadata", folder_id, folder_shortcode
     )
-    if not os.path.isfile(input_path):
-        print(colored(f"""\
-Top level message metadata list missing for folder "{folder_name}", a previous step may have failed.
-Try resetting the index and running indexing again.
-""", "red"))
-        return False
-
-    with open(input_path, "r", encoding="utf-8") as f:
-        message_metadata = json.load(f)
 
     # 5) Write out an organized artifact (non-destructive, separate from input)
     out_dir = ".dsed/index/conversations-organized"
     os.makedirs(out_dir, exist_ok=True)
     output_path = os.path.join(out_dir, f"{folder_shortcode}.json")
 
+    # Already organized: done, without parsing the (large) metadata input
     if os.path.isfile(output_path):
         return True
 
+    try:
+        message_metadata = read_json(input_path)
+    except FileNotFoundError:
+        print(colored(f"""\
+Top level message metadata list missing for folder "{folder_name}", a previous step may have failed.
+Try resetting the index and running indexing again.
+""", "red"))
+        return False
+
     # 2) Group by conversationId
-    conversation_groups = {}
+    conversation_groups = defaultdict(list)
     for meta in message_metadata.values():
         cid = meta.get("conversationId")
         if not cid:
             # Skip items with no conversationId (rare, but defensively handle)
             # Could also bucket them under a sentinel key if desired.
             continue
-        conversation_groups.setdefault(cid, []).append(meta)
+        # defaultdict's C-level miss path, instead of a new [] per setdefault call
+        conversation_groups[cid].append(meta)
 
     # 3) Sort each group internally by conversationIndex latest -> oldest
     #    Outlook/Exchange ordering is achieved by bytewise comparison of conversationIndex.
     #    Ascending bytes = oldest->newest, so we sort ascending then reverse (or sort descending).
-    for cid, metas in conversation_groups.items():
-        def inner_key(m):
-            idx_bytes = _decode_conversation_index(m.get("conversationIndex", ""))
-            # As a stable tie-breaker, use receivedEpoch (ascending = older first),
-            # then id to ensure deterministic ordering.
-            # We'll reverse the whole group later to get latest->oldest.
-            return (idx_bytes, m.get("receivedEpoch", 0), m.get("id", ""))
-
-        metas.sort(key=inner_key)
-        metas.reverse()  # latest -> oldest
+    for metas in conversation_groups.values():
+        # Most conversations are a single message; nothing to order there
+        if len(metas) > 1:
+            metas.sort(key=_conversation_message_sort_key)
+            metas.reverse()  # latest -> oldest
 
     # 4) Sort groups by the receivedEpoch of the first message (already latest in that group)
     #    If missing, treat as 0 so those groups fall to the end.
-    def group_sort_key(item):
-        cid, metas = item
-        first = metas[0] if metas else {}
-        return first.get("receivedEpoch", 0)
+    #    Groups are never empty, so the key is computed once per group up front.
+    keyed_groups = [
+        (metas[0].get("receivedEpoch", 0), cid, metas)
+        for cid, metas in conversation_groups.items()
+    ]
+    keyed_groups.sort(key=itemgetter(0), reverse=True)
 
     # Create a list of (conversationId, [messages...]) sorted latest->oldest by group
-    sorted_conversations = sorted(conversation_groups.items(), key=group_sort_key, reverse=True)
+    sorted_conversations = [(cid, metas) for _epoch, cid, metas in keyed_groups]
 
     conversation_ids = [cid for cid, _ in sorted_conversations if cid]
     conv_id_to_shortcode, conv_shortcode_to_id, conv_length = build_shortcode_map(
         conversation_ids
     )
 
-    result = []
-    for cid, metas in sorted_conversations:
-        message_ids = [m.get("id") for m in metas if m.get("id")]
-        msg_id_to_shortcode, msg_shortcode_to_id, msg_length = build_shortcode_map(
-            message_ids
-        )
-        for meta in metas:
-            message_id = meta.get("id")
-            if message_id:
-                meta["shortcode"] = msg_id_to_shortcode.get(message_id)
-        result.append(
-            {
+    def iter_conversations():
+        for cid, metas in sorted_conversations:
+            # Message shortcodes are scoped to their conversation (and their
+            # length is stored with it), so each group gets its own map; every
+            # message is still hashed only once across the folder
+            message_ids = [meta.get("id") for meta in metas]
+            msg_id_to_shortcode, msg_shortcode_to_id, msg_length = build_shortcode_map(
+                message_ids
+            )
+            for meta, message_id in zip(metas, message_ids):
+                if message_id:
+                    meta["shortcode"] = msg_id_to_shortcode[message_id]
+            yield {
                 "conversationId": cid,
                 "conversationShortcode": conv_id_to_shortcode.get(cid),
                 "messageShortcodes": msg_shortcode_to_id,
                 "messageShortcodeLength": msg_length,
                 "messages": metas,
             }
-        )
 
-    output_payload = {
+    output_header = {
         "folderId": folder_id,
         "folderShortcode": folder_shortcode,
         "conversationShortcodes": conv_shortcode_to_id,
         "conversationShortcodeLength": conv_length,
-        "conversations": result,
     }
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output_payload, f, ensure_ascii=False, indent=2)
+    # Conversations are encoded one at a time as they are built, so the
+    # folder's encoded output is never buffered whole; the file only appears
+    # at output_path once complete, since its presence marks the step done
+    conversation_count = write_json_with_streamed_list(
+        output_path, output_header, "conversations", iter_conversations()
+    )
 
-    print(colored(f'Organized {len(result)} conversation group(s) for folder "{folder_name}" -> {output_path}', "green"))
+    print(colored(f'Organized {conversation_count} conversation group(s) for folder "{folder_name}" -> {output_path}', "green"))
     return True
@@ -1,15 +1,20 @@
-import json
+import base64
 import os
 import re
 import shutil
 import subprocess
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from termcolor import colored
 
 from pysrc.call_route import call_route
+from pysrc.utils.json_io import read_json, write_json, write_json_with_streamed_list
+from pysrc.utils.load_json_cached import load_json_cached
+from pysrc.utils.zstd_text import ZSTD_SUFFIX, copy_expanding_zstd
 
 
 WIN_RESERVED = {
@@ -39,14 +44,25 @@ WIN_RESERVED = {
 
 DEFAULT_NAME = "INVALID_FILENAME"
 
+OUTPUT_MAX_WORKERS = 16
+
+_CONTROL_ONLY = re.compile(r"[\x00-\x1F\x7F]+").fullmatch
+
 
 def _utf8_percent_encode(ch: str) -> str:
     return "".join(f"%{b:02X}" for b in ch.encode("utf-8"))
 
 
+# Control characters and those Windows forbids in names, percent-encoded
+_FILENAME_TABLE = {
+    ord(ch): _utf8_percent_encode(ch)
+    for ch in [*map(chr, range(0x20)), "\x7F", *'<>:"/\\|?*']
+}
+
+
 def _safe_filename(input_name: Optional[str]) -> str:
     name = unicodedata.normalize("NFC", (input_name or "")).strip()
-    if not name or re.fullmatch(r"[\x00-\x1F\x7F]+", name):
+    if not name or _CONTROL_ONLY(name):
         name = DEFAULT_NAME
 
     if name in {".", ".."}:
@@ -62,21 +78,7 @@ def _safe_filename(input_name: Optional[str]) -> str:
     if not name:
         name = DEFAULT_NAME
 
-    encoded = []
-    for ch in name:
-        code = ord(ch)
-        if code <= 0x1F or code == 0x7F:
-            encoded.append(_utf8_percent_encode(ch))
-            continue
-        if ch == "/":
-            encoded.append("%2F")
-            continue
-        if re.search(r'[<>:"/\\|?*]', ch):
-            encoded.append(_utf8_percent_encode(ch))
-            continue
-        encoded.append(ch)
-
-    result = "".join(encoded)
+    result = name.translate(_FILENAME_TABLE)
     return result or DEFAULT_NAME
 
 
@@ -98,9 +100,19 @@ def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+def _ensure_child_dir(path: str) -> None:
+    """
+    _ensure_dir for a path whose parent is known to exist: one mkdir, without
+    makedirs' stat of the parent first.
+    """
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        pass
+
+
 def _write_json(path: str, data: Any) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    write_json(path, data, indent=True)
 
 
 def _parse_iso_datetime(dt_str: Optional[str]) -> Optional[datetime]:
@@ -134,9 +146,13 @@ def _format_datetime_label(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d_%H-%M-%S")
 
 
-def _order_prefix(index: int, total: int, min_digits: int = 2) -> str:
+def _order_prefix_format(total: int, min_digits: int = 2) -> Callable[[int], str]:
+    """
+    Return index -> "__<zero-padded index>__", padded wide enough for total.
+    Built once per folder or conversation, not once per entry.
+    """
     digits = max(min_digits, len(str(max(total, 1))))
-    return f"__{index:0{digits}d}__"
+    return f"__{{:0{digits}d}}__".format
 
 
 def _to_windows_path(path: str) -> Optional[str]:
@@ -148,6 +164,19 @@ def _to_windows_path(path: str) -> Optional[str]:
     return None
 
 
+# UTF-16 and base64 grow a script ~2.7x; CreateProcess allows 32767 chars
+POWERSHELL_SCRIPT_MAX_CHARS = 8000
+# (windows path, ISO datetime) pairs for _flush_folder_times: PowerShell takes
+# far longer to start than to stamp a folder, so they are applied in batches.
+# Conversation workers append concurrently, which list.append makes safe
+_PENDING_WINDOWS_TIMES: List[Tuple[str, str]] = []
+
+
+@lru_cache(maxsize=1)
+def _powershell_exe() -> Optional[str]:
+    return shutil.which("powershell.exe")
+
+
 def _set_folder_times(path: str, dt: datetime) -> None:
     ts = dt.timestamp()
     try:
@@ -155,31 +184,60 @@ def _set_folder_times(path: str, dt: datetime) -> None:
     except Exception:
         pass
 
-    win_path = _to_windows_path(path)
-    if not win_path:
-        return
-    ps = shutil.which("powershell.exe")
-    if not ps:
+    # Outside WSL there is no PowerShell, so nothing to queue for it
+    if _powershell_exe() is None:
         return
-    dt_iso = dt.isoformat()
-    cmd = (
-        f"$dt = [datetime]::Parse('{dt_iso}'); "
-        f"$item = Get-Item -LiteralPath '{win_path}'; "
-        "$item.CreationTime = $dt; "
-        "$item.LastWriteTime = $dt"
-    )
+    win_path = _to_windows_path(path)
+    if win_path:
+        _PENDING_WINDOWS_TIMES.append((win_path, dt.isoformat()))
+
+
+def _ps_quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _run_powershell(ps: str, script: str) -> None:
+    # -EncodedCommand takes UTF-16LE, so non-ASCII subjects in paths survive
+    encoded = base64.b64encode(script.encode("utf-16-le")).decode("ascii")
     try:
-        subprocess.run([ps, "-NoProfile", "-Command", cmd], check=False)
+        subprocess.run([ps, "-NoProfile", "-EncodedCommand", encoded], check=False)
     except Exception:
         pass
 
 
+def _flush_folder_times() -> None:
+    pending = list(_PENDING_WINDOWS_TIMES)
+    _PENDING_WINDOWS_TIMES.clear()
+    if not pending:
+        return
+    ps = _powershell_exe()
+    if not ps:
+        return
+    # A failed Get-Item doesn't stop the rest of the batch; batches are cut
+    # so the encoded script stays well under Windows' command-line limit
+    batch: List[str] = []
+    batch_chars = 0
+    for win_path, dt_iso in pending:
+        statement = (
+            f"$item = Get-Item -LiteralPath {_ps_quote(win_path)}; "
+            f"$dt = [datetime]::Parse({_ps_quote(dt_iso)}); "
+            "$item.CreationTime = $dt; "
+            "$item.LastWriteTime = $dt\n"
+        )
+        if batch and batch_chars + len(statement) > POWERSHELL_SCRIPT_MAX_CHARS:
+            _run_powershell(ps, "".join(batch))
+            batch, batch_chars = [], 0
+        batch.append(statement)
+        batch_chars += len(statement)
+    _run_powershell(ps, "".join(batch))
+
+
 def _load_folder_forest() -> Optional[List[Dict[str, Any]]]:
-    if not os.path.isfile(".dsed/index/folders.json"):
+    try:
+        return load_json_cached(".dsed/index/folders.json")
+    except FileNotFoundError:
         print(colored("Missing .dsed/index/folders.json. Run outlook index first.", "red"))
         return None
-    with open(".dsed/index/folders.json", "r", encoding="utf-8") as f:
-        return json.load(f)
 
 
 def _folder_display_path(node_names: Iterable[str]) -> str:
@@ -190,14 +248,18 @@ def _collect_folders_in_order(
     forest: List[Dict[str, Any]],
 ) -> List[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
     collected: List[Tuple[List[Dict[str, Any]], Dict[str, Any]]] = []
-
-    def recursion(node: Dict[str, Any], prior: List[Dict[str, Any]]) -> None:
+    # Explicit stack (pushed in reverse to keep pre-order), so arbitrarily
+    # deep folder trees can't hit the recursion limit; siblings share their
+    # parents list, which callers only read
+    stack: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = [
+        (root, []) for root in reversed(forest)
+    ]
+    while stack:
+        node, prior = stack.pop()
         collected.append((prior, node))
-        for child in node.get("children", []):
-            recursion(child, prior + [node])
-
-    for root in forest:
-        recursion(root, [])
+        chain = prior + [node]
+        for child in reversed(node.get("children", [])):
+            stack.append((child, chain))
     return collected
 
 
@@ -217,18 +279,51 @@ def _load_folder_conversations(folder_shortcode: str) -> Optional[Dict[str, Any]
             )
         )
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return read_json(path)
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """
+    shutil.copytree copy_function that hardlinks src to dst, so attachments
+    aren't duplicated on disk, falling back to a copy where linking fails
+    (another volume, or a filesystem without hardlinks).
+    """
+    if src.endswith(ZSTD_SUFFIX):
+        return copy_expanding_zstd(src, dst)
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        # Re-export into the same outdir replaces the earlier file, as a copy would
+        os.unlink(dst)
+        return _link_or_copy(src, dst)
+    except OSError:
+        return shutil.copy2(src, dst)
+    return dst
 
 
-def _copy_message_cache(cache_dir: str, output_dir: str) -> bool:
+def _copy_message_cache(cache_dir: str, output_dir: str, hardlink: bool = False) -> bool:
     if not os.path.isdir(cache_dir):
         return False
-    shutil.copytree(cache_dir, output_dir, dirs_exist_ok=True)
+    # .complete is the downloader's resume marker, not part of the message;
+    # compressed _noParse.html backups are written out as plain HTML
+    shutil.copytree(
+        cache_dir,
+        output_dir,
+        dirs_exist_ok=True,
+        ignore=shutil.ignore_patterns(".complete"),
+        copy_function=_link_or_copy if hardlink else copy_expanding_zstd,
+    )
     return True
 
 
-def export_outlook_output(outdir: str, max_subject_chars: int = 36) -> int:
+def export_outlook_output(
+    outdir: str, max_subject_chars: int = 36, hardlink: bool = False
+) -> int:
+    """
+    hardlink: link message files to their .dsed/caches copies instead of
+    copying them; the output then shares those files with the cache, so
+    editing one in place edits the other
+    """
     forest = _load_folder_forest()
     if forest is None:
         return -1
@@ -239,10 +334,11 @@ def export_outlook_output(outdir: str, max_subject_chars: int = 36) -> int:
 
     _ensure_dir(outdir)
 
-    folder_shortcodes = None
-    if os.path.isfile(".dsed/index/shortcodes/folders.json"):
-        with open(".dsed/index/shortcodes/folders.json", "r", encoding="utf-8") as f:
-            folder_shortcodes = json.load(f)
+    # Cached like folders.json, so repeated exports in one process reuse the parse
+    try:
+        folder_shortcodes = load_json_cached(".dsed/index/shortcodes/folders.json")
+    except FileNotFoundError:
+        folder_shortcodes = None
 
     user_data = None
     resp = call_route("/outlook/me", "Fetching user info for output...")
@@ -264,6 +360,150 @@ def export_outlook_output(outdir: str, max_subject_chars: int = 36) -> int:
     _write_json(os.path.join(outdir, "me.json"), me_payload)
 
     folders = _collect_folders_in_order(forest)
+    executor = ThreadPoolExecutor(
+        max_workers=OUTPUT_MAX_WORKERS, thread_name_prefix="dsed-output"
+    )
+    try:
+        return _export_folders(outdir, folders, max_subject_chars, hardlink, executor)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        _flush_folder_times()
+
+
+def _export_conversation(
+    folder_id: str,
+    folder_shortcode: str,
+    folder_out_dir: str,
+    folder_rel: str,
+    conv_prefix: str,
+    conversation: Dict[str, Any],
+    max_subject_chars: int,
+    hardlink: bool,
+) -> bool:
+    """
+    Write one conversation's directory, message caches and index files.
+    folder_rel is folder_out_dir relative to the output root. Returns False
+    if a message's cache is missing.
+    """
+    conversation_id = conversation.get("conversationId")
+    conversation_shortcode = conversation.get("conversationShortcode")
+    messages = conversation.get("messages", [])
+    if not conversation_id or not conversation_shortcode or not isinstance(messages, list):
+        return True
+
+    first_meta = messages[0] if messages else {}
+    conv_dt = _message_datetime(first_meta if isinstance(first_meta, dict) else {})
+    conv_subject_raw = (
+        first_meta.get("subject") if isinstance(first_meta, dict) else None
+    )
+    conv_subject = _truncate_subject(
+        _safe_filename(conv_subject_raw or "no_subject"),
+        limit=max_subject_chars,
+    )
+    conv_label = _format_datetime_label(conv_dt)
+    conv_dir_name = (
+        f"{conv_prefix}{conversation_shortcode}__{conv_label}__{conv_subject}"
+    )
+    conv_out_dir = os.path.join(folder_out_dir, conv_dir_name)
+    # Every name here is built from path-safe segments, so relative paths are
+    # joined alongside the real ones instead of recovered with relpath
+    conv_rel = os.path.join(folder_rel, conv_dir_name)
+    _ensure_child_dir(conv_out_dir)
+    _set_folder_times(conv_out_dir, conv_dt)
+
+    conv_cache_dir = os.path.join(".dsed/caches", folder_shortcode, conversation_shortcode)
+    conv_index_payload = {
+        "folderId": folder_id,
+        "folderShortcode": folder_shortcode,
+        "conversationId": conversation_id,
+        "conversationShortcode": conversation_shortcode,
+        "conversationDateUtc": conv_dt.isoformat(),
+        "conversationSubject": conv_subject_raw,
+        "messageShortcodes": conversation.get("messageShortcodes"),
+        "messageShortcodeLength": conversation.get("messageShortcodeLength"),
+        "outputFolder": conv_rel,
+        "cacheFolder": conv_cache_dir,
+        "messages": [],
+    }
+
+    msg_prefix_format = _order_prefix_format(len(messages))
+    for msg_index, message_meta in enumerate(messages, start=1):
+        if not isinstance(message_meta, dict):
+            continue
+        message_id = message_meta.get("id")
+        message_shortcode = message_meta.get("shortcode")
+        if not message_id or not message_shortcode:
+            continue
+
+        # The first message's date was already parsed for the conversation
+        msg_dt = (
+            conv_dt
+            if message_meta is first_meta
+            else _message_datetime(message_meta)
+        )
+        msg_subject_raw = message_meta.get("subject") or "no_subject"
+        msg_subject = _truncate_subject(
+            _safe_filename(msg_subject_raw),
+            limit=max_subject_chars,
+        )
+        msg_label = _format_datetime_label(msg_dt)
+        msg_prefix = msg_prefix_format(msg_index)
+        msg_dir_name = (
+            f"{msg_prefix}{message_shortcode}__{msg_label}__{msg_subject}"
+        )
+        msg_out_dir = os.path.join(conv_out_dir, msg_dir_name)
+        msg_rel = os.path.join(conv_rel, msg_dir_name)
+
+        cache_dir = os.path.join(conv_cache_dir, message_shortcode)
+        if not _copy_message_cache(cache_dir, msg_out_dir, hardlink):
+            print(
+                colored(
+                    f"Missing cache for message {message_id} ({message_shortcode}).",
+                    "red",
+                )
+            )
+            return False
+
+        msg_index_payload = {
+            "folderId": folder_id,
+            "folderShortcode": folder_shortcode,
+            "conversationId": conversation_id,
+            "conversationShortcode": conversation_shortcode,
+            "messageId": message_id,
+            "messageShortcode": message_shortcode,
+            "receivedDateTime": message_meta.get("receivedDateTime"),
+            "sentDateTime": message_meta.get("sentDateTime"),
+            "subject": message_meta.get("subject"),
+            "cacheRelativePath": cache_dir,
+            "outputFolder": msg_rel,
+        }
+        _write_json(os.path.join(msg_out_dir, "message_index.json"), msg_index_payload)
+
+        conv_index_payload["messages"].append(
+            {
+                "messageId": message_id,
+                "messageShortcode": message_shortcode,
+                "messageMeta": message_meta,
+                "outputFolder": msg_rel,
+            }
+        )
+
+        _set_folder_times(msg_out_dir, msg_dt)
+
+    _write_json(
+        os.path.join(conv_out_dir, "conversation_index.json"),
+        conv_index_payload,
+    )
+    return True
+
+
+def _export_folders(
+    outdir: str,
+    folders: List[Tuple[List[Dict[str, Any]], Dict[str, Any]]],
+    max_subject_chars: int,
+    hardlink: bool,
+    executor: ThreadPoolExecutor,
+) -> int:
     for parents, node in folders:
         folder_id = node.get("id")
         folder_shortcode = node.get("shortcode")
@@ -273,8 +513,11 @@ def export_outlook_output(outdir: str, max_subject_chars: int = 36) -> int:
 
         parent_segments = [_build_folder_segment(p) for p in parents]
         folder_segment = _build_folder_segment(node)
-        folder_out_dir = os.path.join(outdir, *parent_segments, folder_segment)
-        _ensure_dir(folder_out_dir)
+        folder_rel = os.path.join(*parent_segments, folder_segment)
+        folder_out_dir = os.path.join(outdir, folder_rel)
+        # Folders come in pre-order, so the parent's directory (or outdir)
+        # was already created
+        _ensure_child_dir(folder_out_dir)
 
         parent_names = [p.get("name", "") for p in parents]
         display_path = _folder_display_path(parent_names + [node.get("name", "")])
@@ -284,7 +527,7 @@ def export_outlook_output(outdir: str, max_subject_chars: int = 36) -> int:
             return -1
         conversations = conversations_data.get("conversations", [])
 
-        folder_index_payload = {
+        folder_index_header = {
             "folderId": folder_id,
             "folderShortcode": folder_shortcode,
             "name": node.get("name"),
@@ -294,11 +537,16 @@ def export_outlook_output(outdir: str, max_subject_chars: int = 36) -> int:
             "conversationShortcodeLength": conversations_data.get(
                 "conversationShortcodeLength"
             ),
-            "outputFolder": os.path.relpath(folder_out_dir, outdir),
-            "cacheFolder": os.path.relpath(
-                os.path.join(".dsed/caches", folder_shortcode), "."
-            ),
-            "conversations": [
+            "outputFolder": folder_rel,
+            "cacheFolder": os.path.join(".dsed/caches", folder_shortcode),
+        }
+        # Every message's metadata is repeated here, so the entries are
+        # encoded one at a time rather than the whole index at once
+        write_json_with_streamed_list(
+            os.path.join(folder_out_dir, "folder_index.json"),
+            folder_index_header,
+            "conversations",
+            (
                 {
                     "conversationId": c.get("conversationId"),
                     "conversationShortcode": c.get("conversationShortcode"),
@@ -308,116 +556,35 @@ def export_outlook_output(outdir: str, max_subject_chars: int = 36) -> int:
                 }
                 for c in conversations
                 if isinstance(c, dict)
-            ],
-        }
-        _write_json(os.path.join(folder_out_dir, "folder_index.json"), folder_index_payload)
-
-        folder_cache_dir = os.path.join(".dsed/caches", folder_shortcode)
-        total_conversations = len(conversations)
-        for conv_index, conversation in enumerate(conversations, start=1):
-            if not isinstance(conversation, dict):
-                continue
-            conversation_id = conversation.get("conversationId")
-            conversation_shortcode = conversation.get("conversationShortcode")
-            messages = conversation.get("messages", [])
-            if not conversation_id or not conversation_shortcode or not isinstance(messages, list):
-                continue
-
-            first_meta = messages[0] if messages else {}
-            conv_dt = _message_datetime(first_meta if isinstance(first_meta, dict) else {})
-            conv_subject_raw = (
-                first_meta.get("subject") if isinstance(first_meta, dict) else None
-            )
-            conv_subject = _truncate_subject(
-                _safe_filename(conv_subject_raw or "no_subject"),
-                limit=max_subject_chars,
-            )
-            conv_label = _format_datetime_label(conv_dt)
-            conv_prefix = _order_prefix(conv_index, total_conversations)
-            conv_dir_name = (
-                f"{conv_prefix}{conversation_shortcode}__{conv_label}__{conv_subject}"
-            )
-            conv_out_dir = os.path.join(folder_out_dir, conv_dir_name)
-            _ensure_dir(conv_out_dir)
-            _set_folder_times(conv_out_dir, conv_dt)
-
-            conv_cache_dir = os.path.join(folder_cache_dir, conversation_shortcode)
-            conv_index_payload = {
-                "folderId": folder_id,
-                "folderShortcode": folder_shortcode,
-                "conversationId": conversation_id,
-                "conversationShortcode": conversation_shortcode,
-                "conversationDateUtc": conv_dt.isoformat(),
-                "conversationSubject": conv_subject_raw,
-                "messageShortcodes": conversation.get("messageShortcodes"),
-                "messageShortcodeLength": conversation.get("messageShortcodeLength"),
-                "outputFolder": os.path.relpath(conv_out_dir, outdir),
-                "cacheFolder": os.path.relpath(conv_cache_dir, "."),
-                "messages": [],
-            }
-
-            total_messages = len(messages)
-            for msg_index, message_meta in enumerate(messages, start=1):
-                if not isinstance(message_meta, dict):
-                    continue
-                message_id = message_meta.get("id")
-                message_shortcode = message_meta.get("shortcode")
-                if not message_id or not message_shortcode:
-                    continue
-
-                msg_dt = _message_datetime(message_meta)
-                msg_subject_raw = message_meta.get("subject") or "no_subject"
-                msg_subject = _truncate_subject(
-                    _safe_filename(msg_subject_raw),
-                    limit=max_subject_chars,
-                )
-                msg_label = _format_datetime_label(msg_dt)
-                msg_prefix = _order_prefix(msg_index, total_messages)
-                msg_dir_name = (
-                    f"{msg_prefix}{message_shortcode}__{msg_label}__{msg_subject}"
-                )
-                msg_out_dir = os.path.join(conv_out_dir, msg_dir_name)
-
-                cache_dir = os.path.join(conv_cache_dir, message_shortcode)
-                if not _copy_message_cache(cache_dir, msg_out_dir):
-                    print(
-                        colored(
-                            f"Missing cache for message {message_id} ({message_shortcode}).",
-                            "red",
-                        )
-                    )
-                    return -1
-
-                msg_index_payload = {
-                    "folderId": folder_id,
-                    "folderShortcode": folder_shortcode,
-                    "conversationId": conversation_id,
-                    "conversationShortcode": conversation_shortcode,
-                    "messageId": message_id,
-                    "messageShortcode": message_shortcode,
-                    "receivedDateTime": message_meta.get("receivedDateTime"),
-                    "sentDateTime": message_meta.get("sentDateTime"),
-                    "subject": message_meta.get("subject"),
-                    "cacheRelativePath": os.path.relpath(cache_dir, "."),
-                    "outputFolder": os.path.relpath(msg_out_dir, outdir),
-                }
-                _write_json(os.path.join(msg_out_dir, "message_index.json"), msg_index_payload)
-
-                conv_index_payload["messages"].append(
-                    {
-                        "messageId": message_id,
-                        "messageShortcode": message_shortcode,
-                        "messageMeta": dict(message_meta),
-                        "outputFolder": os.path.relpath(msg_out_dir, outdir),
-                    }
-                )
-
-                _set_folder_times(msg_out_dir, msg_dt)
+            ),
+            indent=True,
+        )
 
-            _write_json(
-                os.path.join(conv_out_dir, "conversation_index.json"),
-                conv_index_payload,
+        conv_prefix_format = _order_prefix_format(len(conversations))
+        # Conversations write disjoint directories and spend their time in
+        # file I/O, so they run concurrently; the first failure stops the export
+        futures = [
+            executor.submit(
+                _export_conversation,
+                folder_id,
+                folder_shortcode,
+                folder_out_dir,
+                folder_rel,
+                conv_prefix_format(conv_index),
+                conversation,
+                max_subject_chars,
+                hardlink,
             )
+            for conv_index, conversation in enumerate(conversations, start=1)
+            if isinstance(conversation, dict)
+        ]
+        try:
+            for future in as_completed(futures):
+                if not future.result():
+                    return -1
+        finally:
+            for future in futures:
+                future.cancel()
 
     print(colored("Output export complete.", "green"))
     return 0
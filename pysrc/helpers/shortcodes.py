@@ -1,7 +1,8 @@
 import hashlib
-import json
 import os
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pysrc.utils.json_io import read_json, write_json
 
 SHORTCODE_PREFIX = "__"
 SHORTCODE_SUFFIX = "__"
@@ -26,36 +27,57 @@ def build_shortcode_map(
     if not ids:
         return {}, {}, 0
 
-    digests = {value: _hash_id(value) for value in ids}
+    digests = [_hash_id(value) for value in ids]
     for length in SHORTCODE_LENGTH_STEPS:
-        shortcode_to_id: Dict[str, str] = {}
-        collision = False
-        for value in ids:
-            shortcode = (
-                f"{SHORTCODE_PREFIX}{digests[value][:length]}{SHORTCODE_SUFFIX}"
-            )
-            existing = shortcode_to_id.get(shortcode)
-            if existing and existing != value:
-                collision = True
-                break
-            shortcode_to_id[shortcode] = value
-        if not collision:
-            id_to_shortcode = {value: shortcode for shortcode, value in shortcode_to_id.items()}
-            return id_to_shortcode, shortcode_to_id, length
+        # ids are distinct, so this length works iff its prefixes are too;
+        # the shortcode strings are only formatted for the length that works
+        prefixes = [digest[:length] for digest in digests]
+        if len(set(prefixes)) < len(prefixes):
+            continue
+        shortcode_to_id = {
+            f"{SHORTCODE_PREFIX}{prefix}{SHORTCODE_SUFFIX}": value
+            for prefix, value in zip(prefixes, ids)
+        }
+        id_to_shortcode = {value: shortcode for shortcode, value in shortcode_to_id.items()}
+        return id_to_shortcode, shortcode_to_id, length
 
     raise ValueError("Unable to build unique shortcodes with available lengths.")
 
 
+def reuse_or_build_shortcode_map(
+    values: Iterable[str],
+    saved_shortcode_to_id: Any,
+    saved_length: Any,
+) -> Tuple[Dict[str, str], Dict[str, str], int]:
+    """
+    Like build_shortcode_map, but returns a previously built shortcode->id map
+    (e.g. one stored in an index file) without rehashing when it covers exactly
+    the same ids. Shortcodes depend only on the set of ids, so the saved map is
+    what build_shortcode_map would produce.
+    """
+    values = [value for value in values if value]
+    if (
+        isinstance(saved_shortcode_to_id, dict)
+        and isinstance(saved_length, int)
+        and len(saved_shortcode_to_id) == len(set(values))
+        and set(saved_shortcode_to_id.values()).issuperset(values)
+    ):
+        id_to_shortcode = {
+            value: shortcode for shortcode, value in saved_shortcode_to_id.items()
+        }
+        return id_to_shortcode, saved_shortcode_to_id, saved_length
+    return build_shortcode_map(values)
+
+
 def collect_folder_nodes(folder_forest: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     nodes: List[Dict[str, Any]] = []
-
-    def recursion(node: Dict[str, Any]) -> None:
+    # Pre-order via an explicit stack, so deep folder trees can't hit the
+    # recursion limit
+    stack = list(reversed(folder_forest))
+    while stack:
+        node = stack.pop()
         nodes.append(node)
-        for child in node.get("children", []):
-            recursion(child)
-
-    for root in folder_forest:
-        recursion(root)
+        stack.extend(reversed(node.get("children", [])))
 
     return nodes
 
@@ -63,15 +85,10 @@ def collect_folder_nodes(folder_forest: List[Dict[str, Any]]) -> List[Dict[str,
 def apply_folder_shortcodes(
     folder_forest: List[Dict[str, Any]], id_to_shortcode: Dict[str, str]
 ) -> None:
-    def recursion(node: Dict[str, Any]) -> None:
+    for node in collect_folder_nodes(folder_forest):
         folder_id = node.get("id")
         if folder_id and folder_id in id_to_shortcode:
             node["shortcode"] = id_to_shortcode[folder_id]
-        for child in node.get("children", []):
-            recursion(child)
-
-    for root in folder_forest:
-        recursion(root)
 
 
 def write_shortcode_map(
@@ -79,6 +96,7 @@ def write_shortcode_map(
     id_to_shortcode: Dict[str, str],
     shortcode_to_id: Dict[str, str],
     length: int,
+    ids_digest: Optional[str] = None,
 ) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
     payload = {
@@ -86,5 +104,38 @@ def write_shortcode_map(
         "shortcodeToId": shortcode_to_id,
         "idToShortcode": id_to_shortcode,
     }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, ensure_ascii=False)
+    if ids_digest is not None:
+        payload["idsDigest"] = ids_digest
+    write_json(path, payload)
+
+
+def _ids_digest(values: Iterable[str]) -> str:
+    unique = sorted({value for value in values if value})
+    return hashlib.blake2b("\0".join(unique).encode("utf-8")).hexdigest()
+
+
+def load_or_build_shortcode_map(
+    path: str, values: Iterable[str]
+) -> Tuple[Dict[str, str], Dict[str, str], int]:
+    """
+    Like build_shortcode_map, but reuses the map saved at path when it was
+    built from the same set of ids, and saves a freshly built one otherwise.
+    """
+    values = list(values)
+    digest = _ids_digest(values)
+    try:
+        saved = read_json(path)
+    except (OSError, ValueError):
+        saved = None
+    if (
+        isinstance(saved, dict)
+        and saved.get("idsDigest") == digest
+        and isinstance(saved.get("idToShortcode"), dict)
+        and isinstance(saved.get("shortcodeToId"), dict)
+        and isinstance(saved.get("shortcodeLength"), int)
+    ):
+        return saved["idToShortcode"], saved["shortcodeToId"], saved["shortcodeLength"]
+
+    id_to_shortcode, shortcode_to_id, length = build_shortcode_map(values)
+    write_shortcode_map(path, id_to_shortcode, shortcode_to_id, length, digest)
+    return id_to_shortcode, shortcode_to_id, length
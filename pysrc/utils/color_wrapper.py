@@ -0,0 +1,19 @@
+from typing import Callable
+
+from termcolor import colored
+
+_PLACEHOLDER = "\0"
+
+
+def color_wrapper(color: str) -> Callable[[str], str]:
+    """
+    Return a function equivalent to lambda text: colored(text, color) for
+    use in per-row loops. termcolor is asked once for the escape codes around
+    a placeholder, so its NO_COLOR/FORCE_COLOR/tty decisions still apply.
+    """
+    prefix, _, suffix = colored(_PLACEHOLDER, color).partition(_PLACEHOLDER)
+
+    def wrap(text: str) -> str:
+        return f"{prefix}{text}{suffix}"
+
+    return wrap
@@ -0,0 +1,124 @@
+import json
+import os
+from typing import Any, Dict, Iterable, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def json_dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes, using orjson when available.
+    Non-ASCII is written as-is (like ensure_ascii=False); indent=True gives
+    2-space pretty printing, otherwise output is compact.
+    """
+    if orjson is not None:
+        # OPT_NON_STR_KEYS matches json.dumps, which stringifies int/float keys
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if indent:
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return text.encode("utf-8")
+
+
+def read_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+
+def write_json(path: str, data: Any, indent: bool = False) -> None:
+    with open(path, "wb") as f:
+        f.write(json_dumps(data, indent=indent))
+
+
+def _write_bytes_atomic(path: str, payload: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_json_atomic(path: str, data: Any, indent: bool = False) -> None:
+    """
+    Write JSON to <path>.tmp, fsync it, then rename it over path, so an
+    interrupted run leaves either the old file or the new one, never half of one.
+    """
+    _write_bytes_atomic(path, json_dumps(data, indent=indent))
+
+
+def write_json_if_changed(path: str, data: Any, indent: bool = False) -> bool:
+    """
+    Atomically write JSON to path unless the file already holds exactly the
+    same bytes. Returns True if the file was (re)written.
+    """
+    payload = json_dumps(data, indent=indent)
+    try:
+        with open(path, "rb") as f:
+            if f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+    _write_bytes_atomic(path, payload)
+    return True
+
+
+def write_json_with_streamed_list(
+    path: str,
+    data: Dict[str, Any],
+    list_key: str,
+    items: Iterable[Any],
+    indent: bool = False,
+) -> int:
+    """
+    Atomically write JSON equal to json_dumps({**data, list_key: list(items)},
+    indent=indent), but serialize items one at a time so neither the list nor
+    the whole encoded document is held in memory. Returns the item count.
+    """
+    if indent:
+        # Drop the closing "\n}" (or the "}" of "{}") and lay the list out as
+        # json_dumps would: items two levels deep, every line four spaces in
+        head = json_dumps(data, indent=True)[:-1].rstrip()
+        key_prefix, key_sep = b"\n  ", b": ["
+        item_prefix = b"\n    "
+        list_suffix, empty_suffix = b"\n  ]\n}", b"]\n}"
+    else:
+        head = json_dumps(data)[:-1]
+        key_prefix, key_sep = b"", b":["
+        item_prefix = b""
+        list_suffix = empty_suffix = b"]}"
+    if data:
+        head += b","
+    tmp_path = f"{path}.tmp"
+    count = 0
+    with open(tmp_path, "wb") as f:
+        f.write(head + key_prefix + json_dumps(list_key) + key_sep)
+        for item in items:
+            encoded = json_dumps(item, indent=indent)
+            if indent:
+                # JSON strings never contain a raw newline, so this only
+                # touches the layout
+                encoded = encoded.replace(b"\n", item_prefix)
+            f.write((b"," if count else b"") + item_prefix + encoded)
+            count += 1
+        f.write(list_suffix if count else empty_suffix)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
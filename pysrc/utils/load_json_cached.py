@@ -0,0 +1,23 @@
+import os
+from typing import Any, Dict, Tuple
+
+from pysrc.utils.json_io import read_json
+
+_CACHE: Dict[str, Tuple[int, int, Any]] = {}
+
+
+def load_json_cached(path: str) -> Any:
+    """
+    Load and parse a JSON file, reusing the previous parse for this process
+    when the file's mtime and size have not changed since it was last read.
+
+    The returned object is shared with the cache, so callers that mutate it
+    should write it back (which invalidates the entry) or copy it first.
+    """
+    st = os.stat(path)
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    data = read_json(path)
+    _CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
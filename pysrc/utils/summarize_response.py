@@ -1,19 +1,37 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Any, Optional
 import json
+import re
 import requests
 
+from pysrc.utils.json_io import json_loads
+
+_JSON_MEDIA_TYPE = re.compile(
+    r"\s*(?:application/json|[^;/]*/[^;]*\+json)\s*(?:;|\Z)", re.IGNORECASE
+).match
+
 
 @dataclass
 class ResponseSummary:
     ok: bool
     status: int
     has_response_body: bool
-    text: str
     data: Optional[Any] = None  # Present only if content type is JSON AND body parses
-    
+    _resp: Optional[requests.Response] = field(default=None, repr=False, compare=False)
+
+    @cached_property
+    def text(self) -> str:
+        """
+        The body decoded by requests (declared or apparent encoding), or ""
+        without one. Decoded on first use: JSON callers normally only need data.
+        """
+        if not self.has_response_body or self._resp is None:
+            return ""
+        return self._resp.text
+
     def __str__(self) -> str:
         """
         Return a concise string representation of the response.
@@ -50,17 +68,9 @@ def _is_json_content_type(content_type: str) -> bool:
     """
     if not content_type:
         return False
-    # Take the media type portion before any parameters.
-    media_type = content_type.split(";", 1)[0].strip().lower()
-    # Match application/json or any */*+json (e.g., application/ld+json).
-    if media_type == "application/json":
-        return True
-    # Split type/subtype and check +json suffix on subtype.
-    if "/" in media_type:
-        _type, subtype = media_type.split("/", 1)
-        if subtype.endswith("+json"):
-            return True
-    return False
+    # The media type before any parameters is application/json or has a
+    # +json suffix on its subtype (e.g. application/ld+json)
+    return _JSON_MEDIA_TYPE(content_type) is not None
 
 
 def summarize_response(resp: requests.Response) -> ResponseSummary:
@@ -69,32 +79,33 @@ def summarize_response(resp: requests.Response) -> ResponseSummary:
       - ok: resp.ok
       - status: resp.status_code
       - has_response_body: True if any bytes present
-      - text: always set (empty string if no body)
+      - text: decoded on first access (empty string if no body)
       - data: only set when Content-Type is JSON AND body is valid JSON; else None
     """
     # Detect body presence using raw bytes to avoid decoding issues.
     body_bytes = resp.content or b""
     has_body = len(body_bytes) > 0
 
-    # Always provide text; requests will decode using apparent/declared encoding.
-    # If there's no body, make it an empty string.
-    text = resp.text if has_body else ""
-
     # Only attempt JSON parse when Content-Type explicitly indicates JSON.
     content_type = resp.headers.get("Content-Type", "")
     data: Optional[Any] = None
     if has_body and _is_json_content_type(content_type):
         try:
-            # Parse from text so we honor requests' decoding (charset, etc.)
-            data = json.loads(text)
+            # JSON is UTF-8 on the wire, so parse the raw bytes (orjson when
+            # available) instead of re-scanning the decoded text
+            data = json_loads(body_bytes)
         except (ValueError, TypeError):
-            # If header says JSON but it isn't parseable, leave data=None and keep text.
-            data = None
+            try:
+                # Non-UTF-8 charset: parse from text so we honor requests' decoding
+                data = json.loads(resp.text)
+            except (ValueError, TypeError):
+                # If header says JSON but it isn't parseable, leave data=None; text still has the body.
+                data = None
 
     return ResponseSummary(
         ok=resp.ok,
         status=resp.status_code,
         has_response_body=has_body,
-        text=text,
         data=data,
+        _resp=resp,
     )
\ No newline at end of file
@@ -0,0 +1,40 @@
+import glob
+import os
+import shutil
+import threading
+import uuid
+from typing import List
+
+TRASH_INFIX = ".trash-"
+
+
+def _delete_in_background(paths: List[str]) -> None:
+    def _run() -> None:
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
+
+    # Not a daemon: the interpreter waits for it at exit, so a deletion that
+    # outlives the command still finishes instead of leaving a half-deleted tree
+    threading.Thread(target=_run, name="dsed-trash", daemon=False).start()
+
+
+def trash_dir(path: str) -> bool:
+    """
+    Rename path to a sibling <path>.trash-<uuid> and delete that in a
+    background thread. The rename is immediate on the same volume, so path is
+    free to be recreated right away. Returns False if path did not exist.
+    """
+    trash_path = f"{path.rstrip('/')}{TRASH_INFIX}{uuid.uuid4().hex}"
+    try:
+        os.rename(path, trash_path)
+    except FileNotFoundError:
+        return False
+    _delete_in_background([trash_path])
+    return True
+
+
+def reap_trash(path: str) -> None:
+    """Delete, in the background, trash left by earlier trash_dir(path) calls."""
+    leftovers = glob.glob(f"{glob.escape(path.rstrip('/'))}{TRASH_INFIX}*")
+    if leftovers:
+        _delete_in_background(leftovers)
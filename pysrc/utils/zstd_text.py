@@ -0,0 +1,44 @@
+import os
+import shutil
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - files are left uncompressed
+    zstandard = None
+
+ZSTD_SUFFIX = ".zst"
+ZSTD_LEVEL = 3
+
+
+def write_text_compressed(path: str, text: str) -> str:
+    """
+    Write text as UTF-8 to <path>.zst when zstandard is available, otherwise
+    to path as-is. Returns the path actually written.
+    """
+    data = text.encode("utf-8")
+    if zstandard is None:
+        out_path = path
+    else:
+        out_path = f"{path}{ZSTD_SUFFIX}"
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    # Replace rather than truncate, so a hardlinked copy of the old file survives
+    part_path = f"{out_path}.part"
+    with open(part_path, "wb") as f:
+        f.write(data)
+    os.replace(part_path, out_path)
+    return out_path
+
+
+def copy_expanding_zstd(src: str, dst: str) -> str:
+    """
+    shutil.copytree copy_function that writes *.zst files out decompressed
+    (dropping the suffix) and copies everything else with copy2. Without
+    zstandard the compressed file is copied unchanged.
+    """
+    if zstandard is None or not src.endswith(ZSTD_SUFFIX):
+        return shutil.copy2(src, dst)
+    out_path = dst[: -len(ZSTD_SUFFIX)]
+    with open(src, "rb") as fin, open(out_path, "wb") as fout:
+        zstandard.ZstdDecompressor().copy_stream(fin, fout)
+    shutil.copystat(src, out_path)
+    return out_path
@@ -0,0 +1,123 @@
+import { NextApiResponse } from "next";
+
+import { AuthedNextApiRequest, withAuth } from "@/server/withAuth";
+import { callGraphJSON } from "@/server/msgraph";
+
+type RouteBody = {
+  folderId: string;
+  nextLink?: string | null;
+};
+
+const PAGE_SIZE = 100;
+
+/**
+ * Streams every page of a folder's message id delta in a single response,
+ * one NDJSON record per Graph page:
+ *
+ *   {"messageIds": [...], "nextLink": string | null, "deltaLink": string | null}
+ *
+ * The final page has nextLink === null. If Graph fails after the stream has
+ * started, a last {"error", "text"} record is written instead; clients keep the
+ * most recent nextLink to resume from.
+ */
+const handler = async (req: AuthedNextApiRequest, res: NextApiResponse) => {
+  let streaming = false;
+  try {
+    const openidSub = req.user.sub;
+
+    if (req.method !== "POST") {
+      return res.status(405).json({ error: "Method not allowed" });
+    }
+
+    if (typeof req.body !== "object" || !req.body) {
+      return res.status(400).json({ error: "Invalid request body" });
+    }
+
+    const { folderId, nextLink: previousNextLink } = req.body as RouteBody;
+
+    if (!folderId || typeof folderId !== "string") {
+      return res.status(400).json({ error: "Missing or invalid folderId" });
+    }
+
+    let nextLink: string | null = previousNextLink || null;
+
+    do {
+      const route = nextLink
+        ? nextLink
+        : `/me/mailFolders/${folderId}/messages/delta`;
+
+      const graphResult = await callGraphJSON<{
+        value: Array<{ id: string }>;
+        "@odata.deltaLink"?: string | null;
+        "@odata.nextLink"?: string | null;
+      }>({
+        route,
+        urlParams: nextLink
+          ? undefined
+          : {
+              $select: "id",
+            },
+        additionalHeaders: {
+          Prefer: `odata.maxpagesize=${PAGE_SIZE}`,
+        },
+        method: "GET",
+        openidSub,
+      });
+
+      const failure = !graphResult.ok
+        ? { error: "Failed to fetch messages", text: graphResult.text }
+        : typeof graphResult.data !== "object" || !graphResult.data
+        ? {
+            error: "Invalid response from Microsoft Graph API",
+            text: graphResult.text,
+          }
+        : null;
+
+      if (failure) {
+        if (!streaming) {
+          return res.status(400).json(failure);
+        }
+        res.write(JSON.stringify(failure) + "\n");
+        return res.end();
+      }
+
+      if (!streaming) {
+        res.status(200);
+        res.setHeader("Content-Type", "application/x-ndjson; charset=utf-8");
+        res.setHeader("Cache-Control", "no-cache");
+        streaming = true;
+      }
+
+      const data = graphResult.data!;
+      nextLink = data["@odata.nextLink"] || null;
+      res.write(
+        JSON.stringify({
+          messageIds: data.value.map((message) => message.id),
+          nextLink,
+          deltaLink: data["@odata.deltaLink"] || null,
+        }) + "\n"
+      );
+    } while (nextLink);
+
+    return res.end();
+  } catch (err: any) {
+    const failure = {
+      error: "Failed to stream message id list.",
+      detail: String(err?.message || err),
+    };
+    if (streaming) {
+      res.write(JSON.stringify(failure) + "\n");
+      return res.end();
+    }
+    return res.status(502).json(failure);
+  }
+};
+
+// The body is written incrementally and can exceed Next's default response size warning
+export const config = {
+  api: {
+    responseLimit: false,
+  },
+};
+
+export default withAuth(handler);